@@ -0,0 +1,89 @@
+"""add_foreign_key_indexes
+
+Revision ID: 33d6e3d9f502
+Revises: 2843d6180e5f
+Create Date: 2026-10-16 23:40:12.104873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '33d6e3d9f502'
+down_revision = '2843d6180e5f'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_attendance_event_id', 'attendance', ['event_id']),
+    ('ix_packingequipment_event_id', 'packingequipment', ['event_id']),
+    ('ix_eventmealoption_event_id', 'eventmealoption', ['event_id']),
+    ('ix_mealchoice_event_meal_option_id', 'mealchoice', ['event_meal_option_id']),
+    ('ix_event_coordinator_id', 'event', ['coordinator_id']),
+]
+
+# (constraint name, table, columns), the leading column needs no index of its own
+UNIQUE_CONSTRAINTS = [
+    ('uq_attendance_user_id_event_id', 'attendance', ['user_id', 'event_id']),
+    (
+        'uq_mealchoice_attendance_id_event_meal_option_id',
+        'mealchoice',
+        ['attendance_id', 'event_meal_option_id'],
+    ),
+]
+
+
+def upgrade():
+    # A failed unique build would leave an INVALID index behind, so refuse early
+    connection = op.get_bind()
+    for _, table, columns in UNIQUE_CONSTRAINTS:
+        column_list = ', '.join(columns)
+        duplicates = connection.execute(sa.text(
+            f'SELECT count(*) FROM (SELECT 1 FROM {table} '
+            f'GROUP BY {column_list} HAVING count(*) > 1) AS d'
+        )).scalar_one()
+        if duplicates:
+            raise RuntimeError(
+                f'{table} has {duplicates} duplicated ({column_list}) groups, '
+                'remove them before upgrading'
+            )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction. It does not
+    # block writes while the index builds.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, columns in UNIQUE_CONSTRAINTS:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            # Attaching the built index only takes a brief lock
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}'
+            )
+
+
+def downgrade():
+    for name, table, _ in reversed(UNIQUE_CONSTRAINTS):
+        op.drop_constraint(name, table, type_='unique')
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,26 @@
+"""add_user_token_version
+
+Revision ID: 5b7e2c91d4a8
+Revises: 33d6e3d9f502
+Create Date: 2026-10-16 09:12:44.318201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c91d4a8'
+down_revision = '33d6e3d9f502'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant server default fills existing rows without rewriting the table
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'token_version')
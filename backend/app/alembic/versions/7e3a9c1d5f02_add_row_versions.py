@@ -0,0 +1,30 @@
+"""add_row_versions
+
+Revision ID: 7e3a9c1d5f02
+Revises: b4d1f7a3c2e9
+Create Date: 2026-10-17 11:04:27.506113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '7e3a9c1d5f02'
+down_revision = 'b4d1f7a3c2e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant server default fills existing rows without rewriting the table
+    op.add_column('equipment', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('event', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('meal', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('meal', 'version')
+    op.drop_column('event', 'version')
+    op.drop_column('equipment', 'version')
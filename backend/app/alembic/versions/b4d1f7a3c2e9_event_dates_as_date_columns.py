@@ -0,0 +1,48 @@
+"""event_dates_as_date_columns
+
+Revision ID: b4d1f7a3c2e9
+Revises: 680239548c3f
+Create Date: 2026-10-17 09:12:40.318527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d1f7a3c2e9'
+down_revision = '680239548c3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing values are YYYY-MM-DD strings, which cast directly
+    op.alter_column('event', 'start_date',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(length=10),
+               type_=sa.Date(),
+               existing_nullable=False,
+               postgresql_using='start_date::date')
+    op.alter_column('event', 'end_date',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(length=10),
+               type_=sa.Date(),
+               existing_nullable=False,
+               postgresql_using='end_date::date')
+    op.create_index(op.f('ix_event_start_date'), 'event', ['start_date'], unique=False)
+    op.create_index(op.f('ix_event_end_date'), 'event', ['end_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_event_end_date'), table_name='event')
+    op.drop_index(op.f('ix_event_start_date'), table_name='event')
+    op.alter_column('event', 'end_date',
+               existing_type=sa.Date(),
+               type_=sqlmodel.sql.sqltypes.AutoString(length=10),
+               existing_nullable=False,
+               postgresql_using="to_char(end_date, 'YYYY-MM-DD')")
+    op.alter_column('event', 'start_date',
+               existing_type=sa.Date(),
+               type_=sqlmodel.sql.sqltypes.AutoString(length=10),
+               existing_nullable=False,
+               postgresql_using="to_char(start_date, 'YYYY-MM-DD')")
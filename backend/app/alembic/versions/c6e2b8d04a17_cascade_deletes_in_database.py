@@ -0,0 +1,62 @@
+"""cascade_deletes_in_database
+
+Revision ID: c6e2b8d04a17
+Revises: 7e3a9c1d5f02
+Create Date: 2026-10-17 14:27:51.930462
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2b8d04a17'
+down_revision = '7e3a9c1d5f02'
+branch_labels = None
+depends_on = None
+
+
+# (constraint name, table, column, referred table, ondelete)
+FOREIGN_KEYS = [
+    ('attendance_event_id_fkey', 'attendance', 'event_id', 'event', 'CASCADE'),
+    ('attendance_user_id_fkey', 'attendance', 'user_id', 'user', 'CASCADE'),
+    ('packingequipment_event_id_fkey', 'packingequipment', 'event_id', 'event', 'CASCADE'),
+    ('eventmealoption_event_id_fkey', 'eventmealoption', 'event_id', 'event', 'CASCADE'),
+    ('mealchoice_attendance_id_fkey', 'mealchoice', 'attendance_id', 'attendance', 'CASCADE'),
+    (
+        'mealchoice_event_meal_option_id_fkey',
+        'mealchoice',
+        'event_meal_option_id',
+        'eventmealoption',
+        'CASCADE',
+    ),
+    ('event_coordinator_id_fkey', 'event', 'coordinator_id', 'user', 'SET NULL'),
+]
+
+
+def replace_foreign_keys(with_ondelete):
+    # NOT VALID skips checking existing rows while the tables are locked. They
+    # are checked after that commits, under a lock that doesn't block writes.
+    for name, table, column, referred, ondelete in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name,
+            table,
+            referred,
+            [column],
+            ['id'],
+            ondelete=ondelete if with_ondelete else None,
+            postgresql_not_valid=True,
+        )
+    with op.get_context().autocommit_block():
+        for name, table, *_ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade():
+    replace_foreign_keys(with_ondelete=True)
+
+
+def downgrade():
+    replace_foreign_keys(with_ondelete=False)
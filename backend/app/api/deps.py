@@ -1,4 +1,4 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 from uuid import UUID
 
@@ -8,10 +8,15 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine, replica_async_engine
+from app.core.replica import USER_ID_KEY, PrimarySession, recent_writers
+from app.core.revocation import revocation_list
+from app.core.token_cache import token_cache
+from app.core.user_cache import get_cached_user, get_token_version
 from app.db import Attendance, Event, User
 from app.db.enums import RoleType
 from app.schemas import TokenPayload
@@ -21,6 +26,9 @@ from app.schemas.meal import MealCreate, MealUpdate
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/login/access-token", auto_error=False
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -28,11 +36,32 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Keep attributes loaded after commit: response serialization happens after
+    # the route returns, where an implicit refresh cannot be awaited.
+    async with AsyncSession(
+        async_engine, sync_session_class=PrimarySession, expire_on_commit=False
+    ) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
+OptionalTokenDep = Annotated[str | None, Depends(optional_oauth2)]
 
+STAFF_ROLES = {RoleType.STAFF, RoleType.TEACHER, RoleType.ADMIN}
+STAFF_ONLY = "Only staff members and above can access this resource"
+TEACHER_ROLES = {RoleType.TEACHER, RoleType.ADMIN}
+TEACHER_ONLY = "Only teachers and admins can access this resource"
+ADMIN_ROLES = {RoleType.ADMIN}
+ADMIN_ONLY = "Only admins can access this resource"
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+
+def decode_token(token: str) -> TokenPayload:
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -43,18 +72,143 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    # Tokens without an expiry are valid forever, they are not worth caching
+    if isinstance(payload.get("exp"), int | float):
+        token_cache.put(token, payload["exp"], token_data)
+    return token_data
+
+
+async def get_read_db(
+    session: AsyncSessionDep, token: OptionalTokenDep
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints.
+
+    Served by the replica when one is configured, except for users that wrote
+    recently: they stay on the primary session so they read their own writes.
+    """
+    if replica_async_engine is None or _reads_pinned_to_primary(token):
+        yield session
+        return
+    async with AsyncSession(
+        replica_async_engine, expire_on_commit=False
+    ) as replica_session:
+        yield replica_session
+
+
+def _reads_pinned_to_primary(token: str | None) -> bool:
+    if not token:
+        return False
+    try:
+        token_data = decode_token(token)
+    except HTTPException:
+        # Invalid tokens are rejected by get_current_user where it is required
+        return False
+    return token_data.sub is not None and recent_writers.is_recent(token_data.sub)
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+def _token_user_id(token_data: TokenPayload) -> UUID:
+    try:
+        return UUID(token_data.sub)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=404, detail="User not found")
+
+
+def _check_not_revoked(token: str, token_data: TokenPayload) -> None:
+    if revocation_list.is_revoked(token, token_data):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+
+def _check_token_version(token_data: TokenPayload, token_version: int) -> None:
+    # Tokens without the claim predate token versions and are checked as before
+    if token_data.token_version not in (None, token_version):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> User:
+    token_data = decode_token(token)
+    _check_not_revoked(token, token_data)
+    user = await get_cached_user(session, _token_user_id(token_data))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    _check_token_version(token_data, user.token_version)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    # Lets the session report this user's commits for read-your-writes routing
+    session.info[USER_ID_KEY] = user.id
     return user
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_student(current_user: CurrentUser) -> User:
+async def get_token_claims(session: AsyncSessionDep, token: TokenDep) -> TokenPayload:
+    """
+    Verified claims of the caller, without loading their user row.
+
+    Only the token version is looked up, to reject tokens issued before a role
+    or active flag change. Tokens without claims fall back to the user row.
+    """
+    token_data = decode_token(token)
+    _check_not_revoked(token, token_data)
+    user_id = _token_user_id(token_data)
+    if token_data.token_version is None:
+        user = await get_current_user(session, token)
+        return TokenPayload(
+            sub=str(user.id),
+            role_type=user.role_type,
+            is_active=user.is_active,
+            token_version=user.token_version,
+        )
+    token_version = await get_token_version(session, user_id)
+    if token_version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    _check_token_version(token_data, token_version)
+    if not token_data.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    # Routes gated by require_* write without CurrentUser, so set it here too
+    session.info[USER_ID_KEY] = user_id
+    return token_data
+
+
+TokenClaimsDep = Annotated[TokenPayload, Depends(get_token_claims)]
+
+
+def _check_role(
+    role_type: RoleType | None, allowed: set[RoleType], detail: str
+) -> None:
+    if role_type not in allowed:
+        raise HTTPException(status_code=403, detail=detail)
+
+
+async def require_staff(claims: TokenClaimsDep) -> TokenPayload:
+    """Staff level from the token alone, for dependencies=[...] gates"""
+    _check_role(claims.role_type, STAFF_ROLES, STAFF_ONLY)
+    return claims
+
+
+async def require_teacher(claims: TokenClaimsDep) -> TokenPayload:
+    """Teacher level from the token alone, for dependencies=[...] gates"""
+    _check_role(claims.role_type, TEACHER_ROLES, TEACHER_ONLY)
+    return claims
+
+
+async def require_admin(claims: TokenClaimsDep) -> TokenPayload:
+    """Admin level from the token alone, for dependencies=[...] gates"""
+    _check_role(claims.role_type, ADMIN_ROLES, ADMIN_ONLY)
+    return claims
+
+
+async def get_current_student(current_user: CurrentUser) -> User:
     """Base level - any authenticated user can access"""
     return current_user
 
@@ -62,82 +216,74 @@ def get_current_student(current_user: CurrentUser) -> User:
 CurrentStudent = Annotated[User, Depends(get_current_student)]
 
 
-def get_current_staff(current_user: CurrentUser) -> User:
+async def get_current_staff(current_user: CurrentUser) -> User:
     """Staff level - verifies user is staff or above"""
-    if current_user.role_type not in {RoleType.STAFF, RoleType.TEACHER, RoleType.ADMIN}:
-        raise HTTPException(
-            status_code=403,
-            detail="Only staff members and above can access this resource",
-        )
+    _check_role(current_user.role_type, STAFF_ROLES, STAFF_ONLY)
     return current_user
 
 
 CurrentStaff = Annotated[User, Depends(get_current_staff)]
 
 
-def get_current_teacher(current_user: CurrentUser) -> User:
+async def get_current_teacher(current_user: CurrentUser) -> User:
     """Teacher level - verifies user is teacher or admin"""
-    if current_user.role_type not in {RoleType.TEACHER, RoleType.ADMIN}:
-        raise HTTPException(
-            status_code=403, detail="Only teachers and admins can access this resource"
-        )
+    _check_role(current_user.role_type, TEACHER_ROLES, TEACHER_ONLY)
     return current_user
 
 
 CurrentTeacher = Annotated[User, Depends(get_current_teacher)]
 
 
-def get_current_admin(current_user: CurrentUser) -> User:
+async def get_current_admin(current_user: CurrentUser) -> User:
     """Admin level - verifies user is admin only"""
-    if current_user.role_type != RoleType.ADMIN:
-        raise HTTPException(
-            status_code=403, detail="Only admins can access this resource"
-        )
+    _check_role(current_user.role_type, ADMIN_ROLES, ADMIN_ONLY)
     return current_user
 
 
 CurrentAdmin = Annotated[User, Depends(get_current_admin)]
 
 
-def get_event(event_id: UUID = Path(...), session: Session = Depends(get_db)) -> Event:
+async def get_event(
+    event_id: UUID = Path(...), session: AsyncSession = Depends(get_async_db)
+) -> Event:
     """Get event by ID"""
-    event = session.get(Event, event_id)
+    event = await session.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 
-def get_attendance(
+async def get_attendance(
     event_id: UUID = Path(...),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> Attendance | None:
     """Get attendance for current user and event"""
     statement = select(Attendance).where(
         Attendance.user_id == current_user.id, Attendance.event_id == event_id
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
 EventDep = Annotated[Event, Depends(get_event)]
 AttendanceDep = Annotated[Attendance | None, Depends(get_attendance)]
 
 
-def get_user_attendances(
+async def get_user_attendances(
     current_user: CurrentUser = Depends(get_current_user),
-    session: SessionDep = Depends(get_db),
+    session: AsyncSessionDep = Depends(get_async_db),
 ) -> list[Attendance]:
     """Get all events a user is attending"""
     statement = select(Attendance).where(
         Attendance.user_id == current_user.id, Attendance.is_attending is True
     )
-    return list(session.exec(statement).all())
+    return list((await session.exec(statement)).all())
 
 
 UserAttendancesDep = Annotated[list[Attendance], Depends(get_user_attendances)]
 
 
-def validate_meal_data(meal: MealCreate | MealUpdate) -> MealCreate | MealUpdate:
+async def validate_meal_data(meal: MealCreate | MealUpdate) -> MealCreate | MealUpdate:
     if meal.calories is not None and meal.calories < 0:
         raise HTTPException(status_code=400, detail="Calories cannot be negative")
     if meal.price is not None and meal.price < 0:
@@ -148,7 +294,9 @@ def validate_meal_data(meal: MealCreate | MealUpdate) -> MealCreate | MealUpdate
 MealDataDep = Annotated[MealCreate | MealUpdate, Depends(validate_meal_data)]
 
 
-def get_event_coordinator_or_above(event: EventDep, current_user: CurrentUser) -> Event:
+async def get_event_coordinator_or_above(
+    event: EventDep, current_user: CurrentUser
+) -> Event:
     """
     Verify user is the event coordinator or has a higher role (admin).
     """
@@ -163,15 +311,15 @@ def get_event_coordinator_or_above(event: EventDep, current_user: CurrentUser) -
     return event
 
 
-def validate_event_data(
-    event_data: EventCreate | EventUpdate, session: SessionDep
+async def validate_event_data(
+    event_data: EventCreate | EventUpdate, session: AsyncSessionDep
 ) -> EventCreate | EventUpdate:
     """
     Validate event data for constraints like coordinator existence.
     """
     # Check for non-existent coordinator
     if event_data.coordinator_id:
-        coordinator = session.get(User, event_data.coordinator_id)
+        coordinator = await session.get(User, event_data.coordinator_id)
         if not coordinator:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
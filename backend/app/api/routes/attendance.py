@@ -1,13 +1,25 @@
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import select
+from fastapi import APIRouter, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, select
 
 import app.crud as crud
-from app.api.deps import AttendanceDep, CurrentUser, EventDep, SessionDep
+from app.api.deps import (
+    AsyncSessionDep,
+    AttendanceDep,
+    CurrentUser,
+    EventDep,
+    ReadSessionDep,
+)
+from app.core.counts import CountMode
+from app.core.etag import make_etag, not_modified
+from app.core.pagination import paginate
 from app.db import Attendance, Event
+from app.db.loaders import loader_options
 from app.schemas import (
     EventPackingList,
+    EventPublic,
     Message,
     PackingEquipmentsPublic,
 )
@@ -16,10 +28,10 @@ router = APIRouter(prefix="/attendance", tags=["attendance"])
 
 
 @router.post("/{event_id}/join", response_model=Message)
-def join_event(
+async def join_event(
     event: EventDep,
     attendance: AttendanceDep,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
 ) -> Any:
     """
@@ -36,14 +48,19 @@ def join_event(
         )
         session.add(db_attendance)
 
-    session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # A concurrent join of the same event inserted the attendance first
+        await session.rollback()
+        return Message(message="Already attending this event")
     return Message(message="Successfully joined the event")
 
 
 @router.post("/{event_id}/leave", response_model=Message)
-def leave_event(
+async def leave_event(
     attendance: AttendanceDep,
-    session: SessionDep,
+    session: AsyncSessionDep,
 ) -> Any:
     """
     Student leaves an event by removing the attendance record
@@ -52,88 +69,111 @@ def leave_event(
         return Message(message="Not attending this event")
 
     # Delete the attendance record instead of setting is_attending to False
-    session.delete(attendance)
-    session.commit()
+    await session.delete(attendance)
+    await session.commit()
 
     return Message(message="Successfully left the event")
 
 
-@router.get("/my-events")
-def get_my_events(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+@router.get("/my-events", response_model=list[EventPublic])
+async def get_my_events(
+    session: ReadSessionDep,
+    response: Response,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
 ) -> Any:
     """
-    Get all events the student is attending
+    Get all events the student is attending, ordered by start date. The cursor
+    of the next page is sent as X-Next-Cursor.
     """
-    # First get the attended event IDs from Attendance table
-    statement = (
-        select(Attendance.event_id)
+    events, next_cursor = await paginate(
+        session,
+        select(Event)
+        .join(Attendance)
         .where(Attendance.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
+        .options(*loader_options(EventPublic)),
+        order_by=[Event.start_date, Event.id],  # type: ignore[list-item]
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
     )
-    event_ids = session.exec(statement).all()
-    # Then get those events
-    if event_ids:
-        events = list(session.exec(select(Event).where(Event.id.in_(event_ids))).all())  # type: ignore[attr-defined]
-        return events
-    return []
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return events
 
 
 @router.get("/{event_id}/packing-list", response_model=PackingEquipmentsPublic)
-def get_event_packing_list(
+async def get_event_packing_list(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    request: Request,
+    response: Response,
     attendance: AttendanceDep,
     event: EventDep,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ) -> Any:
     """
-    Get packing list for an event I'm attending
+    Get packing list for an event I'm attending, or a 304 when If-None-Match
+    has its current ETag
     """
     # Check if attending
     if not attendance:
         raise HTTPException(
             status_code=403, detail="Must be attending the event to view packing list"
         )
-
-    equipments, count = crud.get_event_packing_equipments(
-        session=session, event_id=event.id, skip=skip, limit=limit
+    # The event's version covers its packing list and the equipment on it
+    if cached := not_modified(request, response, make_etag(event.id, event.version)):
+        return cached
+
+    equipments, total, next_cursor = await crud.get_event_packing_equipments(
+        session=session,
+        event_id=event.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count_mode=count,
+    )
+    return PackingEquipmentsPublic(
+        data=equipments, count=total, next_cursor=next_cursor
     )
-    return PackingEquipmentsPublic(data=equipments, count=count)
 
 
 @router.get("/my-packing-lists", response_model=list[EventPackingList])
-def get_my_packing_lists(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def get_my_packing_lists(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
     """
     Get packing lists for all events the student is attending
     """
-    # First get all events the student is attending
     attended_events_statement = (
-        select(Event)
+        select(Event.id, Event.name)
         .join(Attendance)
         .where(Attendance.user_id == current_user.id, Attendance.is_attending)
+        .order_by(col(Event.start_date), col(Event.id))
         .offset(skip)
         .limit(limit)
     )
+    attended_events = (await session.exec(attended_events_statement)).all()
 
-    attended_events = session.exec(attended_events_statement).all()
-
-    # Get packing lists for each event
-    packing_lists = []
-    for event in attended_events:
-        equipments, count = crud.get_event_packing_equipments(
-            session=session, event_id=event.id, skip=0, limit=100
-        )
-        packing_lists.append(
-            EventPackingList(
-                event_id=event.id,
-                event_name=event.name,
-                equipments=PackingEquipmentsPublic(data=equipments, count=count),
-            )
+    # All the lists in one batched load, with counts taken from the rows
+    packing_lists = await crud.get_packing_equipments_by_event(
+        session=session, event_ids=[event_id for event_id, _ in attended_events]
+    )
+    return [
+        EventPackingList(
+            event_id=event_id,
+            event_name=event_name,
+            equipments=PackingEquipmentsPublic(
+                data=packing_lists[event_id], count=len(packing_lists[event_id])
+            ),
         )
-
-    return packing_lists
+        for event_id, event_name in attended_events
+    ]
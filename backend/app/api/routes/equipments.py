@@ -1,17 +1,22 @@
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
 
 from app import crud
 from app.api.deps import (
+    AsyncSessionDep,
     CurrentUser,
     EventDep,
-    SessionDep,
-    get_current_teacher,
+    ReadSessionDep,
+    require_teacher,
 )
+from app.core.counts import CountMode, count_rows
+from app.core.etag import make_etag, not_modified
+from app.core.pagination import paginate
 from app.db import Attendance, Equipment, Event, PackingEquipment
+from app.db.loaders import loader_options
 from app.schemas import (
     EquipmentCreate,
     EquipmentPublic,
@@ -28,31 +33,54 @@ router = APIRouter(prefix="/equipments", tags=["equipments"])
 
 @router.get(
     "/",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EquipmentsPublic,
 )
-def read_equipments(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_equipments(
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
+) -> Any:
     """
     Retrieve equipments catalog.
     Only teachers and superusers can access this endpoint.
-    """
-    count_statement = select(func.count()).select_from(Equipment)
-    count = session.exec(count_statement).one()
-    statement = select(Equipment).offset(skip).limit(limit)
-    equipments = session.exec(statement).all()
-    return EquipmentsPublic(data=equipments, count=count)
+    The page has an ETag, and If-None-Match with it gets a 304.
+    """
+    total = await count_rows(session, Equipment, mode=count)
+    equipments, next_cursor = await paginate(
+        session,
+        select(Equipment),
+        order_by=[Equipment.id],  # type: ignore[list-item]
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    # Rows are flat, so the page itself is the cheap lookup and only the
+    # serialization is skipped
+    etag = make_etag(
+        total,
+        next_cursor,
+        *(f"{equipment.id}:{equipment.version}" for equipment in equipments),
+    )
+    if cached := not_modified(request, response, etag):
+        return cached
+    return EquipmentsPublic(data=equipments, count=total, next_cursor=next_cursor)
 
 
 @router.get(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EquipmentPublic,
 )
-def read_equipment(session: SessionDep, id: UUID) -> Any:
+async def read_equipment(session: ReadSessionDep, id: UUID) -> Any:
     """
     Get equipment by ID.
     """
-    equipment = session.get(Equipment, id)
+    equipment = await session.get(Equipment, id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     return equipment
@@ -60,10 +88,12 @@ def read_equipment(session: SessionDep, id: UUID) -> Any:
 
 @router.post(
     "/",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EquipmentPublic,
 )
-def create_equipment(*, session: SessionDep, equipment_in: EquipmentCreate) -> Any:
+async def create_equipment(
+    *, session: AsyncSessionDep, equipment_in: EquipmentCreate
+) -> Any:
     """
     Create new equipment in catalog.
     Only teachers and superusers can create equipments.
@@ -71,19 +101,19 @@ def create_equipment(*, session: SessionDep, equipment_in: EquipmentCreate) -> A
 
     equipment = Equipment.model_validate(equipment_in)
     session.add(equipment)
-    session.commit()
-    session.refresh(equipment)
+    await session.commit()
+    await session.refresh(equipment)
     return equipment
 
 
 @router.put(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EquipmentPublic,
 )
-def update_equipment(
+async def update_equipment(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: UUID,
     equipment_in: EquipmentUpdate,
 ) -> Any:
@@ -91,44 +121,44 @@ def update_equipment(
     Update an equipment.
     Only the teacher who created the equipment or superusers can update it.
     """
-    equipment = session.get(Equipment, id)
+    equipment = await session.get(Equipment, id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
     update_dict = equipment_in.model_dump(exclude_unset=True)
     equipment.sqlmodel_update(update_dict)
     session.add(equipment)
-    session.commit()
-    session.refresh(equipment)
+    await session.commit()
+    await session.refresh(equipment)
     return equipment
 
 
 @router.delete(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
 )
-def delete_equipment(session: SessionDep, id: UUID) -> Message:
+async def delete_equipment(session: AsyncSessionDep, id: UUID) -> Message:
     """
     Delete an equipment.
     Only the teacher who created the equipment or superusers can delete it.
     """
-    equipment = session.get(Equipment, id)
+    equipment = await session.get(Equipment, id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    session.delete(equipment)
-    session.commit()
+    await session.delete(equipment)
+    await session.commit()
     return Message(message="Equipment deleted successfully")
 
 
 @router.post(
     "/{event_id}/packing",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=PackingEquipmentPublic,
 )
-def add_packing_equipment(
+async def add_packing_equipment(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     event: EventDep,
     packing_equipment_in: PackingEquipmentCreate,
 ) -> Any:
@@ -136,11 +166,11 @@ def add_packing_equipment(
     Add an equipment to event's packing list.
     """
 
-    equipment = session.get(Equipment, packing_equipment_in.equipment_id)
+    equipment = await session.get(Equipment, packing_equipment_in.equipment_id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    packing_equipment = crud.create_packing_equipment(
+    packing_equipment = await crud.create_packing_equipment(
         session=session,
         event_id=event.id,
         equipment_id=equipment.id,
@@ -150,31 +180,40 @@ def add_packing_equipment(
 
 
 @router.get("/event/{event_id}/packing", response_model=PackingEquipmentsPublic)
-def list_packing_equipments(
+async def list_packing_equipments(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     event_id: UUID,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ) -> Any:
     """
     List all packing equipments for an event.
     """
-    event = session.get(Event, event_id)
+    event = await session.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    equipments, count = crud.get_event_packing_equipments(
-        session=session, event_id=event_id, skip=skip, limit=limit
+    equipments, total, next_cursor = await crud.get_event_packing_equipments(
+        session=session,
+        event_id=event_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count_mode=count,
+    )
+    return PackingEquipmentsPublic(
+        data=equipments, count=total, next_cursor=next_cursor
     )
-    return PackingEquipmentsPublic(data=equipments, count=count)
 
 
 # For students to view equipments in an event they're attending
 @router.get("/event/{event_id}", response_model=PackingEquipmentsPublic)
-def get_event_equipments(
+async def get_event_equipments(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUser,
     event_id: UUID,
     skip: int = 0,
@@ -185,9 +224,11 @@ def get_event_equipments(
     Students must be attending the event to see its packing list.
     """
     # Check if user is attending the event
-    attendance = session.exec(
-        select(Attendance).where(
-            Attendance.user_id == current_user.id, Attendance.event_id == event_id
+    attendance = (
+        await session.exec(
+            select(Attendance).where(
+                Attendance.user_id == current_user.id, Attendance.event_id == event_id
+            )
         )
     ).first()
 
@@ -200,10 +241,11 @@ def get_event_equipments(
     statement = (
         select(PackingEquipment)
         .where(PackingEquipment.event_id == event_id)
+        .options(*loader_options(PackingEquipmentPublic))
         .offset(skip)
         .limit(limit)
     )
-    equipments = session.exec(statement).all()
+    equipments = (await session.exec(statement)).all()
     count = len(equipments)
 
     return PackingEquipmentsPublic(data=equipments, count=count)
@@ -1,191 +1,450 @@
-from typing import Any
+import calendar
+from collections import defaultdict
+from collections.abc import Callable, Hashable
+from datetime import date
+from typing import Annotated, Any, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import ColumnElement
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app import crud, event_import
 from app.api.deps import (
+    AsyncSessionDep,
     CurrentUser,
     EventDataDep,
-    SessionDep,
-    get_current_teacher,
+    ReadSessionDep,
+    get_current_user,
+    require_teacher,
 )
+from app.core.counts import CountMode, count_rows
+from app.core.etag import make_etag, not_modified
+from app.core.pagination import paginate
 from app.db import (
     Equipment,
     Event,
     EventMealOption,
     Meal,
+    MealChoice,
     PackingEquipment,
 )
+from app.db.loaders import loader_options
 from app.schemas import (
+    EventClone,
+    EventImportResult,
+    EventMealOptionCreate,
+    EventOverview,
     EventPublic,
     EventsPublic,
+    PackingEquipmentCreate,
+    PackingEquipmentsPublic,
 )
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+RowT = TypeVar("RowT")
+ItemT = TypeVar("ItemT")
+
+
+async def get_event_public(session: AsyncSession, id: UUID) -> Event | None:
+    """
+    Load an event with everything EventPublic serializes, replacing any stale
+    copy already in the session.
+    """
+    statement = (
+        select(Event)
+        .where(Event.id == id)
+        .options(*loader_options(EventPublic))
+        .execution_options(populate_existing=True)
+    )
+    return (await session.exec(statement)).first()
+
+
+async def check_ids_exist(
+    session: AsyncSession, model: type[Equipment | Meal], ids: list[UUID], name: str
+) -> None:
+    """
+    Raise a 404 for the first of `ids` without a `model` row, looking them all
+    up in a single query.
+    """
+    if not ids:
+        return
+    statement = select(model.id).where(col(model.id).in_(set(ids)))
+    found = set((await session.exec(statement)).all())
+    for id in ids:
+        if id not in found:
+            raise HTTPException(
+                status_code=404, detail=f"{name} with id {id} not found"
+            )
+
+
+def _pair_by_key(
+    rows: list[RowT], items: list[ItemT], key: Callable[[RowT | ItemT], Hashable]
+) -> tuple[list[tuple[RowT, ItemT]], list[RowT], list[ItemT]]:
+    """
+    Match existing rows to wanted items with the same key, in order.
+
+    Returns the matched pairs, the rows nothing matched and the items nothing
+    matched.
+    """
+    unmatched: dict[Hashable, list[RowT]] = defaultdict(list)
+    for row in rows:
+        unmatched[key(row)].append(row)
+    pairs, added = [], []
+    for item in items:
+        candidates = unmatched.get(key(item))
+        if candidates:
+            pairs.append((candidates.pop(0), item))
+        else:
+            added.append(item)
+    removed = [row for candidates in unmatched.values() for row in candidates]
+    return pairs, removed, added
+
+
+async def sync_packing_equipments(
+    session: AsyncSession, event_id: UUID, items: list[PackingEquipmentCreate]
+) -> None:
+    """
+    Make an event's packing list match `items`, changing only the rows that
+    differ. Rows are matched by equipment.
+    """
+    statement = select(PackingEquipment).where(PackingEquipment.event_id == event_id)
+    rows = list((await session.exec(statement)).all())
+    pairs, removed, added = _pair_by_key(
+        rows, items, lambda row_or_item: row_or_item.equipment_id
+    )
+    # Equipment already on the list needs no check
+    await check_ids_exist(
+        session, Equipment, [item.equipment_id for item in added], "equipment"
+    )
+
+    for row in removed:
+        await session.delete(row)
+    for row, item in pairs:
+        # Only sets attributes that change, so unchanged rows are not updated
+        row.sqlmodel_update(item.model_dump(exclude={"equipment_id"}))
+    session.add_all(
+        PackingEquipment(event_id=event_id, **item.model_dump()) for item in added
+    )
+
+
+async def sync_meal_options(
+    session: AsyncSession, event_id: UUID, options: list[EventMealOptionCreate]
+) -> None:
+    """
+    Make an event's meal options match `options`, changing only the rows that
+    differ. Rows are matched by meal, meal type and day, and options students
+    already chose can't be removed.
+    """
+    statement = select(EventMealOption).where(EventMealOption.event_id == event_id)
+    rows = list((await session.exec(statement)).all())
+    pairs, removed, added = _pair_by_key(
+        rows,
+        options,
+        lambda row_or_option: (
+            row_or_option.meal_id,
+            row_or_option.meal_type,
+            row_or_option.day,
+        ),
+    )
+    await check_ids_exist(session, Meal, [option.meal_id for option in added], "Meal")
+
+    if removed:
+        chosen_statement = (
+            select(MealChoice.event_meal_option_id)
+            .where(
+                col(MealChoice.event_meal_option_id).in_([row.id for row in removed])
+            )
+            .limit(1)
+        )
+        chosen = (await session.exec(chosen_statement)).first()
+        if chosen is not None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Meal option with id {chosen} has meal choices and can't be removed",
+            )
+
+    for row in removed:
+        await session.delete(row)
+    for row, option in pairs:
+        row.sqlmodel_update({"max_quantity": option.max_quantity})
+    session.add_all(
+        EventMealOption(event_id=event_id, **option.model_dump()) for option in added
+    )
+
+
+def overlapping(start: date | None, end: date | None) -> list[ColumnElement[bool]]:
+    """
+    Criteria for events overlapping the days from `start` to `end`, inclusive,
+    either of which may be open. Each bound is a range on one indexed column.
+    """
+    criteria = []
+    if start is not None:
+        criteria.append(col(Event.end_date) >= start)
+    if end is not None:
+        criteria.append(col(Event.start_date) <= end)
+    return criteria
+
 
 @router.get("/", response_model=EventsPublic)
-def read_events(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_events(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
+    from_: Annotated[date | None, Query(alias="from")] = None,
+    to: date | None = None,
+    coordinator_id: UUID | None = None,
+    upcoming: bool = False,
 ) -> Any:
     """
-    Retrieve events.
+    Retrieve events, ordered by start date.
+
+    `from` and `to` keep events overlapping those days, `upcoming` keeps events
+    that haven't ended yet.
     """
     if current_user:
-        count_statement = select(func.count()).select_from(Event)
-        count = session.exec(count_statement).one()
-        statement = select(Event).offset(skip).limit(limit)
-        events = session.exec(statement).all()
-    return EventsPublic(data=events, count=count)
+        if upcoming:
+            today = date.today()
+            from_ = today if from_ is None else max(from_, today)
+        criteria = overlapping(from_, to)
+        if coordinator_id is not None:
+            criteria.append(col(Event.coordinator_id) == coordinator_id)
+        total = await count_rows(session, Event, *criteria, mode=count)
+        events, next_cursor = await paginate(
+            session,
+            select(Event).where(*criteria).options(*loader_options(EventPublic)),
+            order_by=[Event.start_date, Event.id],  # type: ignore[list-item]
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+    return EventsPublic(data=events, count=total, next_cursor=next_cursor)
+
+
+@router.get(
+    "/calendar",
+    dependencies=[Depends(get_current_user)],
+    response_model=EventsPublic,
+)
+async def read_event_calendar(
+    session: ReadSessionDep,
+    year: Annotated[int, Query(ge=1, le=9999)],
+    month: Annotated[int, Query(ge=1, le=12)],
+    coordinator_id: UUID | None = None,
+) -> Any:
+    """
+    Events overlapping a calendar month, ordered by start date.
+    """
+    last_day = calendar.monthrange(year, month)[1]
+    criteria = overlapping(date(year, month, 1), date(year, month, last_day))
+    if coordinator_id is not None:
+        criteria.append(col(Event.coordinator_id) == coordinator_id)
+    statement = (
+        select(Event)
+        .where(*criteria)
+        .options(*loader_options(EventPublic))
+        .order_by(col(Event.start_date), col(Event.id))
+    )
+    events = (await session.exec(statement)).all()
+    return EventsPublic(data=events, count=len(events))
 
 
 @router.get("/{id}", response_model=EventPublic)
-def read_event(
-    session: SessionDep,
+async def read_event(
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
     id: UUID,
 ) -> Any:
     """
-    Get event by ID.
+    Get event by ID, or a 304 when If-None-Match has its current ETag.
     """
-    event = session.get(Event, id)
+    # The version covers the whole EventPublic graph, so a client that is up
+    # to date costs one indexed lookup
+    version = (await session.exec(select(Event.version).where(Event.id == id))).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if cached := not_modified(request, response, make_etag(id, version)):
+        return cached
+
+    event = await get_event_public(session, id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 
+@router.get(
+    "/{id}/overview",
+    dependencies=[Depends(get_current_user)],
+    response_model=EventOverview,
+)
+async def read_event_overview(
+    session: ReadSessionDep,
+    id: UUID,
+    packing_limit: int = 100,
+    count: CountMode = CountMode.EXACT,
+) -> Any:
+    """
+    Get an event with its packing list, meal options with their meal choice
+    totals, and its attendee count.
+
+    Replaces separate calls for the event, its packing list and meal choices,
+    and runs the same number of queries whatever their sizes.
+    """
+    event = await session.get(Event, id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    equipments, equipment_count, next_cursor = await crud.get_event_packing_equipments(
+        session=session, event_id=id, limit=packing_limit, count_mode=count
+    )
+    meal_options = await crud.get_event_meal_option_totals(session=session, event_id=id)
+    attendee_count = await crud.count_event_attendees(
+        session=session, event_id=id, count_mode=count
+    )
+    return EventOverview(
+        **event.model_dump(),
+        packing_equipments=PackingEquipmentsPublic(
+            data=equipments, count=equipment_count, next_cursor=next_cursor
+        ),
+        meal_options=meal_options,
+        attendee_count=attendee_count,
+    )
+
+
 @router.post(
     "/",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EventPublic,
 )
-def create_event(*, session: SessionDep, event_in: EventDataDep) -> Any:
+async def create_event(*, session: AsyncSessionDep, event_in: EventDataDep) -> Any:
     """
     Create new event with packing Equipments and meal options.
     Only teachers and superusers can create events.
     """
-
-    # Create event
-    event = Event.model_validate(
-        event_in.model_dump(exclude={"packing_equipments", "meal_options"})
+    # Validate every reference before writing, so a missing id leaves nothing
+    # half-created
+    await check_ids_exist(
+        session,
+        Equipment,
+        [item.equipment_id for item in event_in.packing_equipments or []],
+        "equipment",
+    )
+    await check_ids_exist(
+        session,
+        Meal,
+        [option.meal_id for option in event_in.meal_options or []],
+        "Meal",
     )
+
+    event, packing_equipments, meal_options = crud.build_event(event_in)
     session.add(event)
-    session.commit()
-    session.refresh(event)
-
-    # Add packing Equipments if provided
-    if event_in.packing_equipments:
-        for equipment_data in event_in.packing_equipments:
-            # Verify equipment exists
-            equipment = session.get(Equipment, equipment_data.equipment_id)
-            if not equipment:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"equipment with id {equipment_data.equipment_id} not found",
-                )
-            # Create packing equipment with all details
-            packing_equipment = PackingEquipment(
-                event_id=event.id,
-                equipment_id=equipment_data.equipment_id,
-                quantity=equipment_data.quantity,
-                required=equipment_data.required,
-                notes=equipment_data.notes,
-            )
-            session.add(packing_equipment)
-        session.commit()
-        session.refresh(event)
-
-    # Add meal options if provided
-    if event_in.meal_options:
-        for meal_option in event_in.meal_options:
-            # Verify meal exists
-            meal = session.get(Meal, meal_option.meal_id)
-            if not meal:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Meal with id {meal_option.meal_id} not found",
-                )
-            # Create event meal option
-            event_meal = EventMealOption(event_id=event.id, **meal_option.model_dump())
-            session.add(event_meal)
-        session.commit()
-        session.refresh(event)
+    session.add_all(packing_equipments)
+    session.add_all(meal_options)
+    await session.commit()
 
-    return event
+    return await get_event_public(session, event.id)
+
+
+@router.post(
+    "/import",
+    dependencies=[Depends(require_teacher)],
+    response_model=EventImportResult,
+)
+async def bulk_import_events(session: AsyncSessionDep, request: Request) -> Any:
+    """
+    Create events from a CSV (text/csv) or NDJSON (application/x-ndjson)
+    request body, read as it streams in.
+
+    CSV has a header row naming event fields, with packing_equipments and
+    meal_options as JSON arrays. NDJSON has one event object per line, shaped
+    like the body of POST /events/. Rows that fail are listed with their line,
+    the others are still created.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in event_import.FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Upload must be one of {', '.join(event_import.FORMATS)}",
+        )
+    return await event_import.import_events(session, request.stream(), content_type)
+
+
+@router.post(
+    "/{id}/clone",
+    dependencies=[Depends(require_teacher)],
+    response_model=EventPublic,
+)
+async def clone_event(
+    *, session: AsyncSessionDep, id: UUID, clone_in: EventClone
+) -> Any:
+    """
+    Copy an event with its packing list and meal options, optionally under a
+    new name and moved to a new start date. The rows are copied inside the
+    database in one transaction.
+    """
+    new_id = await crud.clone_event(session=session, event_id=id, clone_in=clone_in)
+    if new_id is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    await session.commit()
+    return await get_event_public(session, new_id)
 
 
 @router.put(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=EventPublic,
 )
-def update_event(
+async def update_event(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: UUID,
     event_in: EventDataDep,
 ) -> Any:
     """
-    Update an event and its packing equipments.
+    Update an event, its packing equipments and meal options.
     """
     # Check event exists and permissions
-    event = session.get(Event, id)
+    event = await session.get(Event, id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
     # Update event basic info
     update_dict = event_in.model_dump(
-        exclude_unset=True, exclude={"packing_equipments"}
+        exclude_unset=True, exclude={"packing_equipments", "meal_options"}
     )
     event.sqlmodel_update(update_dict)
     session.add(event)
 
-    # Update packing equipments if provided
     if event_in.packing_equipments is not None:
-        # First verify all equipments exist
-        for equipment_data in event_in.packing_equipments:
-            if not session.get(Equipment, equipment_data.equipment_id):
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"equipment with id {equipment_data.equipment_id} not found",
-                )
-
-        statement = delete(PackingEquipment).where(
-            PackingEquipment.event_id == event.id  # type: ignore
-        )
-        session.exec(statement)  # type: ignore
-        # Add new packing equipments
-        for equipment_data in event_in.packing_equipments:
-            packing_equipment = PackingEquipment(
-                event_id=event.id,
-                equipment_id=equipment_data.equipment_id,
-                quantity=equipment_data.quantity,
-                required=equipment_data.required,
-                notes=equipment_data.notes,
-            )
-            session.add(packing_equipment)
+        await sync_packing_equipments(session, event.id, event_in.packing_equipments)
+    if event_in.meal_options is not None:
+        await sync_meal_options(session, event.id, event_in.meal_options)
 
-    session.commit()
-    session.refresh(event)
-    return event
+    await session.commit()
+    return await get_event_public(session, event.id)
 
 
 @router.delete(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
 )
-def delete_event(
+async def delete_event(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: UUID,
 ) -> Any:
     """
-    Delete an event.
+    Delete an event. Its attendances, meal choices, packing list and meal
+    options are deleted by the database in the same statement.
     """
-    event = session.get(Event, id)
-    if not event:
+    result = await session.execute(delete(Event).where(col(Event.id) == id))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Event not found")
-
-    session.delete(event)
-    session.commit()
+    await session.commit()
     return {"message": "Event deleted"}
@@ -2,9 +2,11 @@ from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUser, ReadSessionDep
 from app.db import (
     Attendance,
     EventMealOption,
@@ -19,21 +21,40 @@ from app.schemas import (
 router = APIRouter(prefix="/meal-choices", tags=["meal-choices"])
 
 
+async def save_meal_choice(session: AsyncSession, meal_choice: MealChoice) -> None:
+    """
+    Commit a meal choice, or a 409 when its attendance already chose that meal
+    option. The unique constraint decides, so concurrent requests can't both win.
+    """
+    session.add(meal_choice)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="This meal option is already chosen for the attendance",
+        )
+    await session.refresh(meal_choice)
+
+
 @router.post("/", response_model=MealChoice)
-def create_meal_choice(
+async def create_meal_choice(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     meal_choice_in: MealChoiceCreate,
 ) -> Any:
     """Create meal choice for an attendance."""
     # Verify attendance exists and belongs to user
-    attendance = session.get(Attendance, meal_choice_in.attendance_id)
+    attendance = await session.get(Attendance, meal_choice_in.attendance_id)
     if not attendance or attendance.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Attendance not found")
 
     # Verify meal option exists
-    meal_option = session.get(EventMealOption, meal_choice_in.event_meal_option_id)
+    meal_option = await session.get(
+        EventMealOption, meal_choice_in.event_meal_option_id
+    )
     if not meal_option or meal_option.event_id != attendance.event_id:
         raise HTTPException(status_code=404, detail="Meal option not found")
 
@@ -43,15 +64,13 @@ def create_meal_choice(
         quantity=meal_choice_in.quantity,
         notes=meal_choice_in.notes,
     )
-    session.add(meal_choice)
-    session.commit()
-    session.refresh(meal_choice)
+    await save_meal_choice(session, meal_choice)
     return meal_choice
 
 
 @router.get("/", response_model=list[MealChoice])
-def read_meal_choices(
-    session: SessionDep,
+async def read_meal_choices(
+    session: ReadSessionDep,
     current_user: CurrentUser,
     attendance_id: UUID | None = None,
 ) -> Any:
@@ -59,25 +78,25 @@ def read_meal_choices(
     statement = select(MealChoice)
     if attendance_id:
         # Verify attendance belongs to user
-        attendance = session.get(Attendance, attendance_id)
+        attendance = await session.get(Attendance, attendance_id)
         if not attendance or attendance.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Attendance not found")
         statement = statement.where(MealChoice.attendance_id == attendance_id)
 
-    meal_choices = session.exec(statement).all()
+    meal_choices = (await session.exec(statement)).all()
     return meal_choices
 
 
 @router.put("/{id}", response_model=MealChoice)
-def update_meal_choice(
+async def update_meal_choice(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     id: UUID,
     meal_choice_in: MealChoiceUpdate,
 ) -> Any:
     """Update a meal choice."""
-    meal_choice = session.get(MealChoice, id)
+    meal_choice = await session.get(MealChoice, id)
     if not meal_choice:
         raise HTTPException(status_code=404, detail="Meal choice not found")
 
@@ -86,7 +105,7 @@ def update_meal_choice(
         pass  # Allow admin to proceed
     else:
         # Others must verify ownership
-        attendance = session.get(Attendance, meal_choice.attendance_id)
+        attendance = await session.get(Attendance, meal_choice.attendance_id)
         if not attendance or attendance.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
 
@@ -98,29 +117,27 @@ def update_meal_choice(
     if meal_choice_in.notes is not None:
         meal_choice.notes = meal_choice_in.notes
 
-    session.add(meal_choice)
-    session.commit()
-    session.refresh(meal_choice)
+    await save_meal_choice(session, meal_choice)
     return meal_choice
 
 
 @router.delete("/{id}")
-def delete_meal_choice(
+async def delete_meal_choice(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     id: UUID,
 ) -> Any:
     """Delete a meal choice."""
-    meal_choice = session.get(MealChoice, id)
+    meal_choice = await session.get(MealChoice, id)
     if not meal_choice:
         raise HTTPException(status_code=404, detail="Meal choice not found")
 
     # Verify ownership
-    attendance = session.get(Attendance, meal_choice.attendance_id)
+    attendance = await session.get(Attendance, meal_choice.attendance_id)
     if not attendance or attendance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    session.delete(meal_choice)
-    session.commit()
+    await session.delete(meal_choice)
+    await session.commit()
     return {"message": "Meal choice deleted"}
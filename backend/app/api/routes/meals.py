@@ -1,15 +1,18 @@
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlmodel import select
 
 from app.api.deps import (
+    AsyncSessionDep,
     MealDataDep,
-    SessionDep,
-    get_current_staff,
-    get_current_teacher,
+    ReadSessionDep,
+    require_staff,
+    require_teacher,
 )
+from app.core.etag import make_etag, not_modified
+from app.core.pagination import paginate
 from app.db import Meal
 from app.schemas import (
     MealPublic,
@@ -20,10 +23,10 @@ router = APIRouter(prefix="/meals", tags=["meals"])
 
 @router.post(
     "/",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=MealPublic,
 )
-def create_meal(*, session: SessionDep, meal_in: MealDataDep) -> Any:
+async def create_meal(*, session: AsyncSessionDep, meal_in: MealDataDep) -> Any:
     """
     Create new meal. Only teachers and superusers can create meals.
 
@@ -39,46 +42,64 @@ def create_meal(*, session: SessionDep, meal_in: MealDataDep) -> Any:
     """
     meal = Meal(**meal_in.model_dump())
     session.add(meal)
-    session.commit()
-    session.refresh(meal)
+    await session.commit()
+    await session.refresh(meal)
     return meal
 
 
 @router.get(
     "/",
-    dependencies=[Depends(get_current_staff)],
+    dependencies=[Depends(require_staff)],
     response_model=list[MealPublic],
 )
-def read_meals(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    """Retrieve meals."""
-
-    statement = select(Meal).offset(skip).limit(limit)
-    meals = session.exec(statement).all()
+async def read_meals(
+    session: ReadSessionDep,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Any:
+    """Retrieve meals. The cursor of the next page is sent as X-Next-Cursor."""
+
+    meals, next_cursor = await paginate(
+        session,
+        select(Meal),
+        order_by=[Meal.id],  # type: ignore[list-item]
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return meals
 
 
 @router.get("/{id}", response_model=MealPublic)
-def read_meal(session: SessionDep, id: UUID) -> Any:
-    """Get meal by ID."""
-    meal = session.get(Meal, id)
+async def read_meal(
+    session: ReadSessionDep, request: Request, response: Response, id: UUID
+) -> Any:
+    """Get meal by ID, or a 304 when If-None-Match has its current ETag."""
+    meal = await session.get(Meal, id)
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
+    if cached := not_modified(request, response, make_etag(meal.id, meal.version)):
+        return cached
     return meal
 
 
 @router.put(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
     response_model=MealPublic,
 )
-def update_meal(
+async def update_meal(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: UUID,
     meal_in: MealDataDep,
 ) -> Any:
     """Update a meal."""
-    meal = session.get(Meal, id)
+    meal = await session.get(Meal, id)
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
 
@@ -87,25 +108,25 @@ def update_meal(
         setattr(meal, field, value)
 
     session.add(meal)
-    session.commit()
-    session.refresh(meal)
+    await session.commit()
+    await session.refresh(meal)
     return meal
 
 
 @router.delete(
     "/{id}",
-    dependencies=[Depends(get_current_teacher)],
+    dependencies=[Depends(require_teacher)],
 )
-def delete_meal(
+async def delete_meal(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: UUID,
 ) -> Any:
     """Delete a meal."""
-    meal = session.get(Meal, id)
+    meal = await session.get(Meal, id)
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
 
-    session.delete(meal)
-    session.commit()
+    await session.delete(meal)
+    await session.commit()
     return {"message": "Meal deleted"}
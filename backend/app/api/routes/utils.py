@@ -1,8 +1,18 @@
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_admin
-from app.schemas import Message
+from app.api.deps import require_admin
+from app.core.db import async_engine, engine, replica_async_engine
+from app.core.hashing import password_hasher
+from app.core.pool import get_pool_status
+from app.core.token_cache import token_cache
+from app.schemas import (
+    Message,
+    PasswordHashingStatus,
+    PoolsStatus,
+    PoolStatus,
+    TokenCacheStatus,
+)
 from app.utils import generate_test_email, send_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -10,7 +20,7 @@ router = APIRouter(prefix="/utils", tags=["utils"])
 
 @router.post(
     "/test-email/",
-    dependencies=[Depends(get_current_admin)],
+    dependencies=[Depends(require_admin)],
     status_code=201,
 )
 def test_email(email_to: EmailStr) -> Message:
@@ -29,3 +39,50 @@ def test_email(email_to: EmailStr) -> Message:
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(require_admin)],
+    response_model=PoolsStatus,
+)
+async def db_pool_status() -> PoolsStatus:
+    """
+    Connection pool usage of the worker that served this request.
+    """
+    pools = [
+        PoolStatus.model_validate(get_pool_status("async", async_engine.sync_engine)),
+        PoolStatus.model_validate(get_pool_status("sync", engine)),
+    ]
+    if replica_async_engine is not None:
+        pools.append(
+            PoolStatus.model_validate(
+                get_pool_status("replica", replica_async_engine.sync_engine)
+            )
+        )
+    return PoolsStatus(data=pools, count=len(pools))
+
+
+@router.get(
+    "/password-hashing/",
+    dependencies=[Depends(require_admin)],
+    response_model=PasswordHashingStatus,
+)
+async def password_hashing_status() -> PasswordHashingStatus:
+    """
+    Password hashing pool usage of the worker that served this request.
+    """
+    return PasswordHashingStatus.model_validate(password_hasher.status())
+
+
+@router.get(
+    "/token-cache/",
+    dependencies=[Depends(require_admin)],
+    response_model=TokenCacheStatus,
+)
+async def token_cache_status() -> TokenCacheStatus:
+    """
+    Verified access token cache usage and hit rate of the worker that served
+    this request.
+    """
+    return TokenCacheStatus.model_validate(token_cache.stats())
@@ -0,0 +1,10 @@
+"""
+In-process load and latency benchmarks for the API.
+
+Run from the backend directory against the database configured in .env:
+
+    python -m app.benchmarks run --output results/main.json
+    python -m app.benchmarks compare results/main.json results/branch.json
+
+Every run seeds its own users, events and meals, and removes them afterwards.
+"""
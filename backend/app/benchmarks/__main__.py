@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import json
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlmodel import Session
+
+from app.benchmarks.fixtures import BenchmarkData, cleanup, seed
+from app.benchmarks.runner import run_scenario
+from app.benchmarks.scenarios import SCENARIO_NAMES, build_scenarios
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.main import app
+
+# Metrics shown by `compare`, as paths into a scenario's results
+COMPARED_METRICS = [
+    ("latency_ms", "p50"),
+    ("latency_ms", "p95"),
+    ("latency_ms", "p99"),
+    ("throughput_rps",),
+    ("queries_per_request", "mean"),
+]
+
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout.strip() or None
+
+
+async def run_scenarios(
+    data: BenchmarkData, names: list[str], args: argparse.Namespace
+) -> dict[str, Any]:
+    scenarios = build_scenarios(data)
+    results: dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for name in names:
+                results[name] = await run_scenario(
+                    client,
+                    scenarios[name],
+                    requests=args.requests,
+                    concurrency=args.concurrency,
+                    warmup=args.warmup,
+                )
+                print_result(name, results[name])
+    finally:
+        # Pooled async connections belong to this event loop
+        await async_engine.dispose()
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    names = args.scenario or list(SCENARIO_NAMES)
+    with Session(engine) as session:
+        data = seed(
+            session,
+            users=args.users,
+            events=args.events,
+            requests=args.requests + args.warmup,
+        )
+    try:
+        results = asyncio.run(run_scenarios(data, names, args))
+    finally:
+        with Session(engine) as session:
+            cleanup(session, data)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "database": f"{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}",
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "users": args.users,
+            "events": args.events,
+            "pool_size": settings.POSTGRES_POOL_SIZE,
+            "pool_max_overflow": settings.POSTGRES_POOL_MAX_OVERFLOW,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+
+def print_result(name: str, result: dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{name:<12} {result['requests']:>6} req  "
+        f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+        f"p99 {latency['p99']:>8.2f} ms  {result['throughput_rps']:>8.2f} req/s  "
+        f"{result['queries_per_request']['mean']} queries/req  "
+        f"{result['errors']} errors"
+    )
+
+
+def compare(args: argparse.Namespace) -> None:
+    base = json.loads(args.base.read_text())
+    new = json.loads(args.new.read_text())
+    print(f"base {base['commit']} ({base['created_at']})")
+    print(f"new  {new['commit']} ({new['created_at']})")
+    for name in sorted(base["scenarios"].keys() & new["scenarios"].keys()):
+        print(f"\n{name}")
+        for path in COMPARED_METRICS:
+            before, after = base["scenarios"][name], new["scenarios"][name]
+            for key in path:
+                before, after = before[key], after[key]
+            if before and after is not None:
+                change = f"{(after - before) / before:+.1%}"
+            else:
+                change = "n/a"
+            print(f"  {'.'.join(path):<26} {before!s:>10} {after!s:>10} {change:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run scenarios and report")
+    run_parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIO_NAMES,
+        help="scenario to run, can be repeated, all by default",
+    )
+    run_parser.add_argument("--requests", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=10)
+    run_parser.add_argument("--warmup", type=int, default=10)
+    run_parser.add_argument("--users", type=int, default=50)
+    run_parser.add_argument("--events", type=int, default=20)
+    run_parser.add_argument("--output", type=Path, help="write results as JSON")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
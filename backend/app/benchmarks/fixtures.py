@@ -0,0 +1,165 @@
+import math
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlmodel import Session, col, delete, select
+
+from app.core.security import create_user_access_token, get_password_hash
+from app.db import (
+    Attendance,
+    Equipment,
+    Event,
+    EventMealOption,
+    Meal,
+    MealChoice,
+    MealType,
+    PackingEquipment,
+    User,
+)
+from app.db.enums import RoleType
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+@dataclass
+class BenchmarkData:
+    """Rows seeded for one benchmark run, and what scenarios need to use them."""
+
+    prefix: str
+    student_emails: list[str] = field(default_factory=list)
+    student_tokens: list[str] = field(default_factory=list)
+    # One event per burst of joins, every student joins each of them once
+    burst_event_ids: list[uuid.UUID] = field(default_factory=list)
+    # attendance_ids[i] belongs to student i, on the meal event
+    attendance_ids: list[uuid.UUID] = field(default_factory=list)
+    meal_option_ids: list[uuid.UUID] = field(default_factory=list)
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+    event_ids: list[uuid.UUID] = field(default_factory=list)
+    equipment_ids: list[uuid.UUID] = field(default_factory=list)
+    meal_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+def seed(
+    session: Session,
+    *,
+    users: int,
+    events: int,
+    requests: int,
+    packing_per_event: int = 5,
+    meals_per_event: int = 3,
+) -> BenchmarkData:
+    """
+    Insert the rows the scenarios run against.
+
+    `requests` sizes the burst events and meal options so that no join or meal
+    choice in a run hits a row that an earlier request already created.
+    """
+    data = BenchmarkData(prefix=f"bench-{uuid.uuid4().hex[:8]}")
+    # Hash once, bcrypt would otherwise dominate seeding
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+
+    coordinator = User(
+        email=f"{data.prefix}-coordinator@example.com",
+        hashed_password=hashed_password,
+        role_type=RoleType.TEACHER,
+    )
+    students = [
+        User(
+            email=f"{data.prefix}-{i}@example.com",
+            hashed_password=hashed_password,
+            role_type=RoleType.STUDENT,
+        )
+        for i in range(users)
+    ]
+    equipments = [
+        Equipment(title=f"{data.prefix}-{i}", category="Other", location="Unknown")
+        for i in range(packing_per_event)
+    ]
+    meals = [
+        Meal(name=f"{data.prefix}-{i}", restaurant=data.prefix)
+        for i in range(meals_per_event)
+    ]
+    session.add_all([coordinator, *students, *equipments, *meals])
+    session.flush()
+
+    def new_event(name: str) -> Event:
+        event = Event(
+            name=f"{data.prefix}-{name}",
+            start_date=date(2024, 7, 1),
+            end_date=date(2024, 7, 5),
+            coordinator_id=coordinator.id,
+        )
+        session.add(event)
+        return event
+
+    listed_events = [new_event(f"listed-{i}") for i in range(events)]
+    burst_events = [
+        new_event(f"burst-{i}") for i in range(math.ceil(requests / max(users, 1)))
+    ]
+    meal_event = new_event("meals")
+    session.flush()
+
+    for event in listed_events:
+        session.add_all(
+            PackingEquipment(event_id=event.id, equipment_id=equipment.id)
+            for equipment in equipments
+        )
+        session.add_all(
+            EventMealOption(
+                event_id=event.id, meal_id=meal.id, meal_type=MealType.LUNCH, day=1
+            )
+            for meal in meals
+        )
+    meal_options = [
+        EventMealOption(
+            event_id=meal_event.id,
+            meal_id=meals[i % len(meals)].id,
+            meal_type=MealType.DINNER,
+            day=i + 1,
+        )
+        for i in range(math.ceil(requests / max(users, 1)))
+    ]
+    attendances = [
+        Attendance(user_id=student.id, event_id=meal_event.id) for student in students
+    ]
+    session.add_all([*meal_options, *attendances])
+    data.student_emails = [student.email for student in students]
+    data.student_tokens = [
+        create_user_access_token(student, expires_delta=timedelta(hours=1))
+        for student in students
+    ]
+    data.burst_event_ids = [event.id for event in burst_events]
+    data.attendance_ids = [attendance.id for attendance in attendances]
+    data.meal_option_ids = [option.id for option in meal_options]
+    data.user_ids = [coordinator.id, *(student.id for student in students)]
+    data.event_ids = [event.id for event in (*listed_events, *burst_events, meal_event)]
+    data.equipment_ids = [equipment.id for equipment in equipments]
+    data.meal_ids = [meal.id for meal in meals]
+    # Read everything above first, committing expires the seeded objects
+    session.commit()
+    return data
+
+
+def cleanup(session: Session, data: BenchmarkData) -> None:
+    """Delete everything `seed` created, and the rows the scenarios added."""
+    attendances = select(Attendance.id).where(
+        col(Attendance.user_id).in_(data.user_ids)
+    )
+    statements = [
+        delete(MealChoice).where(col(MealChoice.attendance_id).in_(attendances)),
+        delete(Attendance).where(col(Attendance.user_id).in_(data.user_ids)),
+        delete(EventMealOption).where(
+            col(EventMealOption.event_id).in_(data.event_ids)
+        ),
+        delete(PackingEquipment).where(
+            col(PackingEquipment.event_id).in_(data.event_ids)
+        ),
+        delete(Event).where(col(Event.id).in_(data.event_ids)),
+        delete(Meal).where(col(Meal.id).in_(data.meal_ids)),
+        delete(Equipment).where(col(Equipment.id).in_(data.equipment_ids)),
+        delete(User).where(col(User.id).in_(data.user_ids)),
+    ]
+    for statement in statements:
+        session.execute(statement)
+    session.commit()
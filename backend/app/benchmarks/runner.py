@@ -0,0 +1,112 @@
+import asyncio
+import math
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+# Sends request number `index` of a run, indexes are never reused within a run
+SendRequest = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    send: SendRequest
+
+
+@dataclass
+class Sample:
+    latency_ms: float
+    status_code: int
+    queries: int | None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linearly interpolated percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    indexes: range,
+    concurrency: int,
+) -> list[Sample]:
+    samples: list[Sample] = []
+    # Shared by all workers, each takes the next index when it is free
+    pending: Iterator[int] = iter(indexes)
+
+    async def worker() -> None:
+        for index in pending:
+            start = time.perf_counter()
+            response = await scenario.send(client, index)
+            latency_ms = (time.perf_counter() - start) * 1000
+            queries = response.headers.get("X-Query-Count")
+            samples.append(
+                Sample(
+                    latency_ms=latency_ms,
+                    status_code=response.status_code,
+                    queries=int(queries) if queries is not None else None,
+                )
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(
+    scenario: Scenario, samples: list[Sample], elapsed_s: float, concurrency: int
+) -> dict[str, Any]:
+    latencies = [sample.latency_ms for sample in samples]
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    status_codes = Counter(str(sample.status_code) for sample in samples)
+    return {
+        "description": scenario.description,
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "errors": sum(1 for sample in samples if sample.status_code >= 400),
+        "status_codes": dict(sorted(status_codes.items())),
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(samples) / elapsed_s, 2) if elapsed_s else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries, default=None),
+        },
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> dict[str, Any]:
+    """
+    Send `warmup` unmeasured requests, then `requests` measured ones, keeping
+    `concurrency` of them in flight.
+    """
+    await _drive(client, scenario, range(warmup), concurrency)
+    start = time.perf_counter()
+    samples = await _drive(
+        client, scenario, range(warmup, warmup + requests), concurrency
+    )
+    return summarize(scenario, samples, time.perf_counter() - start, concurrency)
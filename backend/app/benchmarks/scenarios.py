@@ -0,0 +1,58 @@
+import httpx
+
+from app.benchmarks.fixtures import BENCHMARK_PASSWORD, BenchmarkData
+from app.benchmarks.runner import Scenario
+from app.core.config import settings
+
+SCENARIO_NAMES = ("login", "join", "list_events", "meal_choice")
+
+
+def build_scenarios(data: BenchmarkData) -> dict[str, Scenario]:
+    """Scenarios modelled on production traffic, run against seeded `data`."""
+    api = settings.API_V1_STR
+    students = len(data.student_tokens)
+
+    def auth(index: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {data.student_tokens[index % students]}"}
+
+    async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.post(
+            f"{api}/login/access-token",
+            data={
+                "username": data.student_emails[index % students],
+                "password": BENCHMARK_PASSWORD,
+            },
+        )
+
+    async def join(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        # Every student joins one event before the burst moves to the next
+        event_id = data.burst_event_ids[index // students]
+        return await client.post(
+            f"{api}/attendance/{event_id}/join", headers=auth(index)
+        )
+
+    async def list_events(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get(f"{api}/events/", headers=auth(index))
+
+    async def choose_meal(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.post(
+            f"{api}/meal-choices/",
+            headers=auth(index),
+            json={
+                "attendance_id": str(data.attendance_ids[index % students]),
+                "event_meal_option_id": str(data.meal_option_ids[index // students]),
+                "quantity": 1,
+            },
+        )
+
+    scenarios = [
+        Scenario("login", "Password logins spread over all students", login),
+        Scenario("join", "Students joining the same event at once", join),
+        Scenario(
+            "list_events",
+            "Event listing with nested packing equipments and meal options",
+            list_events,
+        ),
+        Scenario("meal_choice", "Students submitting meal choices", choose_meal),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
@@ -34,6 +34,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Authenticated users are cached per worker, 0 disables the cache
+    USER_CACHE_SECONDS: float = 30.0
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Verified access tokens kept per worker until they expire, 0 disables
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    # How often each worker polls for tokens revoked by other workers
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    # bcrypt cost, existing hashes are upgraded on their next successful login
+    BCRYPT_ROUNDS: int = 12
+    # Threads hashing passwords per worker, and requests waiting beyond them
+    # before new ones are turned away with a 429
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    # Failed logins allowed per email and per client address within the
+    # window before attempts are refused without hashing, 0 disables a limit
+    LOGIN_FAILURE_WINDOW_SECONDS: float = 900.0
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 10
+    LOGIN_MAX_FAILURES_PER_IP: int = 100
+    # Rows validated and committed together by the bulk event import
+    EVENT_IMPORT_BATCH_SIZE: int = 200
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -55,6 +75,21 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pool, sized per engine per worker process
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_POOL_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    # Seconds before a connection is replaced, -1 to keep connections forever
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_USE_LIFO: bool = False
+    # Optional streaming replica for read-only endpoints, same credentials
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+    # Seconds a user's reads stay on the primary after they commit a write
+    POSTGRES_REPLICA_STICKY_SECONDS: float = 5.0
+    # How long an exact list total is reused before counting again
+    LIST_COUNT_CACHE_SECONDS: float = 10.0
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -68,6 +103,32 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+psycopg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def sqlalchemy_pool_options(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.POSTGRES_POOL_SIZE,
+            "max_overflow": self.POSTGRES_POOL_MAX_OVERFLOW,
+            "pool_timeout": self.POSTGRES_POOL_TIMEOUT,
+            "pool_recycle": self.POSTGRES_POOL_RECYCLE,
+            "pool_pre_ping": self.POSTGRES_POOL_PRE_PING,
+            "pool_use_lifo": self.POSTGRES_POOL_USE_LIFO,
+        }
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -0,0 +1,159 @@
+import functools
+import json
+import threading
+import time
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import ColumnElement, event, func
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+# Session.info key collecting the tables a transaction wrote to
+WRITTEN_TABLES_KEY = "written_tables"
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class CountCache:
+    """
+    Exact row counts per table and filter, kept for `ttl_seconds`.
+
+    Commits that write to a table drop its counts on this worker; other workers
+    catch up when the TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._counts: dict[str, dict[Any, tuple[float, int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, table: str, key: Any) -> int | None:
+        with self._lock:
+            entry = self._counts.get(table, {}).get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def store(self, table: str, key: Any, count: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        deadline = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._counts.setdefault(table, {})[key] = (deadline, count)
+
+    def invalidate(self, tables: set[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._counts.pop(table, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+count_cache = CountCache(settings.LIST_COUNT_CACHE_SECONDS)
+
+
+async def count_rows(
+    session: AsyncSession,
+    model: type[SQLModel],
+    *criteria: ColumnElement[bool],
+    mode: CountMode = CountMode.EXACT,
+) -> int | None:
+    """
+    Total rows of `model` matching `criteria` for a list envelope.
+
+    EXACT runs `count(*)` and caches the result, ESTIMATE reads the planner's
+    row estimate without scanning, NONE skips counting and returns None.
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    dialect = session.get_bind().dialect
+    table: str = model.__tablename__  # type: ignore[assignment]
+    if mode == CountMode.ESTIMATE:
+        compiled = select(model).where(*criteria).compile(dialect=dialect)
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    statement = select(func.count()).select_from(model).where(*criteria)
+    compiled = statement.compile(dialect=dialect)
+    key = (str(compiled), tuple(sorted(compiled.params.items())))
+    count = count_cache.get(table, key)
+    if count is None:
+        count = (await session.exec(statement)).one()
+        count_cache.store(table, key, count)
+    return count
+
+
+@functools.cache
+def cascaded_tables(table: str) -> frozenset[str]:
+    """
+    Tables whose rows the database deletes or updates through ON DELETE foreign
+    keys when rows of `table` are deleted, following cascades.
+    """
+    found: set[str] = set()
+    pending = [table]
+    while pending:
+        referred = pending.pop()
+        for other in SQLModel.metadata.tables.values():
+            for foreign_key in other.foreign_keys:
+                if (
+                    foreign_key.ondelete is not None
+                    and foreign_key.column.table.name == referred
+                    and other.name not in found
+                ):
+                    found.add(other.name)
+                    if foreign_key.ondelete.upper() == "CASCADE":
+                        pending.append(other.name)
+    return frozenset(found)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, _flush_context: UOWTransaction) -> None:
+    tables = session.info.setdefault(WRITTEN_TABLES_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table is not None:
+            tables.add(table)
+    for obj in session.deleted:
+        table = getattr(obj, "__tablename__", None)
+        if table is not None:
+            tables |= cascaded_tables(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state: ORMExecuteState) -> None:
+    mapper = orm_execute_state.bind_mapper
+    if not orm_execute_state.is_select and mapper is not None:
+        tables = orm_execute_state.session.info.setdefault(WRITTEN_TABLES_KEY, set())
+        table = mapper.local_table.name  # type: ignore[attr-defined]
+        tables.add(table)
+        if orm_execute_state.is_delete:
+            tables |= cascaded_tables(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(session: Session) -> None:
+    tables = session.info.pop(WRITTEN_TABLES_KEY, None)
+    if tables:
+        count_cache.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_tables(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES_KEY, None)
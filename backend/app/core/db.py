@@ -1,12 +1,31 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
+from app.core.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 from app.db import User
 from app.db.enums import RoleType
 from app.schemas import UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **settings.sqlalchemy_pool_options,
+)
+# psycopg 3 serves both engines: SQLAlchemy picks its async driver for this one
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **settings.sqlalchemy_pool_options,
+)
+replica_async_engine: AsyncEngine | None = None
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    replica_async_engine = create_async_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **settings.sqlalchemy_pool_options,
+    )
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,37 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag for a representation identified by `parts`, such as row ids and
+    versions.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists `etag`, or is `*`."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    A 304 to return instead of the body when the client already has `etag`.
+
+    Otherwise sets `etag` on `response` and returns None, and the route goes on
+    to build the body.
+    """
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+from app.core.pool import WaitTimeHistogram
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Thread pool reserved for bcrypt, so password hashing can't take over the
+    threads every other sync dependency and route runs in.
+
+    bcrypt releases the GIL, so `workers` hashes run in parallel. Up to
+    `max_queue` more wait for a thread; past that, requests are shed with a
+    429 instead of queueing behind seconds of hashing.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        # Submitted jobs that haven't finished, running or waiting for a thread
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self.wait_histogram = WaitTimeHistogram()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many password requests, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            self.wait_histogram.observe((time.perf_counter() - submitted) * 1000)
+            with self._lock:
+                self._running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._executor.submit(job)
+        # Released when the hash finishes, even if the request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future: Future[Any]) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            pending, running = self._pending, self._running
+            completed, rejected = self._completed, self._rejected
+        return {
+            "pid": os.getpid(),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": pending - running,
+            "completed": completed,
+            "rejected": rejected,
+            "wait_time": self.wait_histogram.snapshot(),
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(security.get_password_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(
+        security.verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_dummy_password(plain_password: str) -> bool:
+    return await password_hasher.run(security.verify_dummy_password, plain_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_hasher.run(
+        security.verify_and_update_password, plain_password, hashed_password
+    )
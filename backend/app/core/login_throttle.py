@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Protocol
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+class FailureStore(Protocol):
+    """
+    Where failed login timestamps are kept, by key.
+
+    The in-memory store only sees failures on its own worker. A store shared by
+    all workers, such as one backed by Redis, can be swapped in with
+    `login_throttle.store = ...` at startup.
+    """
+
+    async def recent(self, key: str, window_seconds: float) -> list[float]:
+        """Failure times within the window, oldest first."""
+        ...
+
+    async def add(self, key: str, at: float, window_seconds: float) -> None: ...
+
+    async def clear(self, key: str) -> None: ...
+
+
+class MemoryFailureStore:
+    """
+    Failure times per key on this worker.
+
+    Only the latest `max_per_key` failures of a key are kept, which is all a
+    threshold needs, and the least recently failing keys are dropped past
+    `max_keys`.
+    """
+
+    def __init__(self, max_per_key: int, max_keys: int = 100_000) -> None:
+        self.max_per_key = max_per_key
+        self.max_keys = max_keys
+        self._failures: OrderedDict[str, deque[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def recent(self, key: str, window_seconds: float) -> list[float]:
+        since = time.time() - window_seconds
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None:
+                return []
+            while failures and failures[0] <= since:
+                failures.popleft()
+            if not failures:
+                del self._failures[key]
+            return list(failures)
+
+    async def add(self, key: str, at: float, window_seconds: float) -> None:
+        with self._lock:
+            failures = self._failures.pop(key, None)
+            if failures is None:
+                failures = deque(maxlen=self.max_per_key)
+            failures.append(at)
+            self._failures[key] = failures
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+
+    async def clear(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class LoginThrottle:
+    """
+    Sliding-window counters of failed logins, per email and per client address.
+
+    Once either reaches its limit within `window_seconds`, attempts are refused
+    before the password is hashed, until the oldest failure leaves the window.
+    A limit of 0 disables that counter.
+    """
+
+    def __init__(
+        self,
+        store: FailureStore,
+        window_seconds: float,
+        max_per_email: int,
+        max_per_ip: int,
+    ) -> None:
+        self.store = store
+        self.window_seconds = window_seconds
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+
+    def _limits(self, email: str, ip: str | None) -> list[tuple[str, int]]:
+        limits = [(f"email:{email.lower()}", self.max_per_email)]
+        if ip is not None:
+            limits.append((f"ip:{ip}", self.max_per_ip))
+        return [(key, limit) for key, limit in limits if limit > 0]
+
+    async def check(self, email: str, ip: str | None) -> None:
+        """Raise a 429 when the email or address failed too often recently."""
+        for key, limit in self._limits(email, ip):
+            failures = await self.store.recent(key, self.window_seconds)
+            if len(failures) >= limit:
+                # Free again once enough failures have left the window
+                retry_at = failures[len(failures) - limit] + self.window_seconds
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many failed login attempts, try again later",
+                    headers={"Retry-After": str(max(int(retry_at - time.time()), 1))},
+                )
+
+    async def record_failure(self, email: str, ip: str | None) -> None:
+        now = time.time()
+        for key, _ in self._limits(email, ip):
+            await self.store.add(key, now, self.window_seconds)
+
+    async def record_success(self, email: str) -> None:
+        # The address keeps its failures, one valid account must not reset a
+        # client that is trying many others
+        await self.store.clear(f"email:{email.lower()}")
+
+
+login_throttle = LoginThrottle(
+    MemoryFailureStore(
+        max(settings.LOGIN_MAX_FAILURES_PER_EMAIL, settings.LOGIN_MAX_FAILURES_PER_IP)
+    ),
+    settings.LOGIN_FAILURE_WINDOW_SECONDS,
+    settings.LOGIN_MAX_FAILURES_PER_EMAIL,
+    settings.LOGIN_MAX_FAILURES_PER_IP,
+)
@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+T = TypeVar("T")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor holding the sort key of the last row of a page."""
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, order_by: Sequence[InstrumentedAttribute[Any]]
+) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError(cursor)
+        return [
+            # Validate against the model field type, e.g. str -> uuid.UUID
+            TypeAdapter(
+                column.class_.model_fields[column.key].annotation
+            ).validate_python(value)
+            for column, value in zip(order_by, values, strict=True)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: SelectOfScalar[T],
+    *,
+    order_by: Sequence[InstrumentedAttribute[Any]],
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> tuple[list[T], str | None]:
+    """
+    Fetch one page of `statement` ordered by the unique key `order_by`.
+
+    With a cursor the page starts right after the row it was taken from, which
+    is an index range scan however deep the page is. Without one, `skip` is
+    applied as an offset for older clients. Either way the returned cursor
+    points at the next page, or is None on the last one.
+    """
+    statement = statement.order_by(*order_by)
+    if cursor is not None:
+        after = decode_cursor(cursor, order_by)
+        statement = statement.where(tuple_(*order_by) > tuple_(*after))
+    elif skip:
+        statement = statement.offset(skip)
+    # One extra row tells whether another page exists
+    rows = list((await session.exec(statement.limit(limit + 1))).all())
+    next_cursor = None
+    if limit > 0 and len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_by])
+    return rows[:limit], next_cursor
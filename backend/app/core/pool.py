@@ -0,0 +1,94 @@
+import bisect
+import os
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+# Upper bounds, in milliseconds, of the connection checkout wait-time buckets
+WAIT_BUCKETS_MS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 5000.0)
+
+
+class WaitTimeHistogram:
+    """Cumulative histogram of how long callers waited for a pooled connection."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS_MS) -> None:
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        index = bisect.bisect_left(self.buckets, wait_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._total_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total_ms = self._total_ms
+            max_ms = self._max_ms
+        labels = [f"le_{bound:g}ms" for bound in self.buckets] + ["inf"]
+        return {
+            "count": sum(counts),
+            "total_ms": round(total_ms, 3),
+            "max_ms": round(max_ms, 3),
+            "buckets": dict(zip(labels, counts, strict=True)),
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long every checkout waited for a connection."""
+
+    wait_histogram: WaitTimeHistogram
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitTimeHistogram()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - start) * 1000)
+
+    def recreate(self) -> QueuePool:
+        # Keep the histogram across engine.dispose(), it describes the worker
+        new_pool = super().recreate()
+        if isinstance(new_pool, InstrumentedQueuePool):
+            new_pool.wait_histogram = self.wait_histogram
+        return new_pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Async-adapted variant of InstrumentedQueuePool for create_async_engine."""
+
+
+def get_pool_status(name: str, engine: Engine) -> dict[str, Any]:
+    """
+    Report checked out, idle and overflow connections for an engine's pool.
+    """
+    pool: Pool = engine.pool
+    status: dict[str, Any] = {
+        "name": name,
+        "pid": os.getpid(),
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            # QueuePool counts overflow from -size upwards
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        status["wait_time"] = pool.wait_histogram.snapshot()
+    return status
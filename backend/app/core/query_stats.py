@@ -0,0 +1,57 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+# Attribute set on the execution context while its statement runs
+_START_ATTR = "_query_stats_start"
+
+
+@dataclass
+class QueryStats:
+    """Statements executed, and time spent in them, while tracking was on."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the statements any engine executes in this context.
+
+    Tasks, threadpool calls and async session greenlets started inside the
+    block copy the context, so queries they run are counted as well.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(
+    _conn: Any, _cursor: Any, _statement: str, _params: Any, context: Any, _many: bool
+) -> None:
+    if _current_stats.get() is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(
+    _conn: Any, _cursor: Any, _statement: str, _params: Any, context: Any, _many: bool
+) -> None:
+    stats = _current_stats.get()
+    start = getattr(context, _START_ATTR, None)
+    if stats is not None and start is not None:
+        stats.count += 1
+        stats.duration_ms += (time.perf_counter() - start) * 1000
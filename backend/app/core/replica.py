@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, UOWTransaction
+from sqlmodel import Session
+
+from app.core.config import settings
+
+# Session.info keys used to tie a primary session to the user it serves
+USER_ID_KEY = "user_id"
+HAS_WRITES_KEY = "has_writes"
+
+
+class RecentWriters:
+    """
+    Users that committed a write in the last `window_seconds` on this worker.
+
+    Their reads are kept on the primary so they never read their own write back
+    from a replica that has not replayed it yet.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10_000) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._deadlines: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines.pop(user_id, None)
+            self._deadlines[user_id] = now + self.window_seconds
+            # Entries are ordered by deadline, so expired ones sit at the front
+            while self._deadlines:
+                oldest_id, deadline = next(iter(self._deadlines.items()))
+                if deadline > now and len(self._deadlines) <= self.max_entries:
+                    break
+                del self._deadlines[oldest_id]
+
+    def is_recent(self, user_id: str) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(user_id)
+        return deadline is not None and deadline > time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._deadlines.clear()
+
+
+recent_writers = RecentWriters(settings.POSTGRES_REPLICA_STICKY_SECONDS)
+
+
+class PrimarySession(Session):
+    """Session on the primary that reports committed writes to `recent_writers`."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_flush(session: Session, _flush_context: UOWTransaction) -> None:
+    session.info[HAS_WRITES_KEY] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES_KEY] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_writer(session: Session) -> None:
+    if session.info.pop(HAS_WRITES_KEY, False):
+        user_id: Any = session.info.get(USER_ID_KEY)
+        if user_id is not None:
+            recent_writers.mark(str(user_id))
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _forget_writes(session: Session) -> None:
+    session.info.pop(HAS_WRITES_KEY, None)
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.db import RevokedToken
+from app.schemas import TokenPayload
+
+logger = logging.getLogger(__name__)
+
+# Rows are polled by revoked_at, which is set before the inserting transaction
+# commits, so each poll re-reads this far back to catch rows committed late
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RevocationList:
+    """
+    In-memory snapshot of the revoked token table, checked on every request.
+
+    Each worker loads the unexpired rows at startup and then only polls for
+    rows revoked since the last poll. Revocations made by this worker apply
+    immediately, those made by other workers after their next poll.
+    """
+
+    def __init__(self) -> None:
+        # Token digest to when the token expires
+        self._tokens: dict[str, float] = {}
+        # User id to the second their tokens were revoked, and when those expire
+        self._users: dict[str, tuple[float, float]] = {}
+        self._watermark: datetime | None = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, token: str, token_data: TokenPayload) -> bool:
+        with self._lock:
+            if self._tokens and token_digest(token) in self._tokens:
+                return True
+            user_entry = self._users.get(token_data.sub or "")
+        # Tokens without iat predate revocation, and every revoked user
+        return user_entry is not None and (token_data.iat or 0) < user_entry[0]
+
+    def add(self, rows: Iterable[RevokedToken]) -> None:
+        with self._lock:
+            for row in rows:
+                expires_at = row.expires_at.timestamp()
+                if row.token_digest is not None:
+                    self._tokens[row.token_digest] = expires_at
+                if row.user_id is not None:
+                    key = str(row.user_id)
+                    # iat is in whole seconds, so a token issued later in the
+                    # same second must not count as revoked
+                    revoked_at = math.floor(row.revoked_at.timestamp())
+                    previous = self._users.get(key)
+                    if previous is None or previous[0] < revoked_at:
+                        self._users[key] = (revoked_at, expires_at)
+                if self._watermark is None or row.revoked_at > self._watermark:
+                    self._watermark = row.revoked_at
+
+    def prune(self) -> None:
+        """Forget revocations whose tokens have expired anyway."""
+        now = time.time()
+        with self._lock:
+            self._tokens = {
+                digest: expires_at
+                for digest, expires_at in self._tokens.items()
+                if expires_at > now
+            }
+            self._users = {
+                user_id: entry
+                for user_id, entry in self._users.items()
+                if entry[1] > now
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+            self._watermark = None
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Load rows revoked since the last refresh, or all unexpired ones."""
+        statement = select(RevokedToken)
+        if self._watermark is None:
+            statement = statement.where(
+                RevokedToken.expires_at > datetime.now(timezone.utc)
+            )
+        else:
+            statement = statement.where(
+                RevokedToken.revoked_at > self._watermark - REFRESH_OVERLAP
+            )
+        self.add((await session.exec(statement)).all())
+        self.prune()
+
+
+revocation_list = RevocationList()
+
+
+async def _store(session: AsyncSession, row: RevokedToken) -> None:
+    session.add(row)
+    await session.commit()
+    revocation_list.add([row])
+
+
+async def revoke_token(
+    session: AsyncSession, token: str, token_data: TokenPayload
+) -> None:
+    """Revoke one token, until it expires."""
+    now = datetime.now(timezone.utc)
+    if token_data.exp is not None:
+        expires_at = datetime.fromtimestamp(token_data.exp, timezone.utc)
+    else:
+        expires_at = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    await _store(
+        session,
+        RevokedToken(
+            token_digest=token_digest(token), revoked_at=now, expires_at=expires_at
+        ),
+    )
+
+
+async def revoke_user_tokens(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Revoke every token issued to a user so far."""
+    now = datetime.now(timezone.utc)
+    await _store(
+        session,
+        RevokedToken(
+            user_id=user_id,
+            revoked_at=now,
+            expires_at=now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        ),
+    )
+
+
+async def purge_expired_revocations(session: AsyncSession) -> None:
+    statement = delete(RevokedToken).where(
+        col(RevokedToken.expires_at) <= datetime.now(timezone.utc)
+    )
+    await session.exec(statement)  # type: ignore[call-overload]
+    await session.commit()
+
+
+async def refresh_revocations_forever(interval_seconds: float) -> None:
+    """Poll for other workers' revocations, run as a task for the app lifetime."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSession(async_engine) as session:
+                await revocation_list.refresh(session)
+        except Exception:
+            logger.exception("Could not refresh revoked tokens")
@@ -1,3 +1,5 @@
+import functools
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -5,23 +7,70 @@ import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.db import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with another cost verify fine and are flagged for a rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 
 ALGORITHM = "HS256"
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
-    expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+def create_access_token(
+    subject: str | Any,
+    expires_delta: timedelta,
+    claims: dict[str, Any] | None = None,
+) -> str:
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        **(claims or {}),
+        "iat": now,
+        "exp": now + expires_delta,
+        "sub": str(subject),
+    }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_user_access_token(user: User, expires_delta: timedelta) -> str:
+    """Access token with the claims role-gated routes authorize from."""
+    return create_access_token(
+        user.id,
+        expires_delta,
+        claims={
+            "role_type": user.role_type.value,
+            "is_active": user.is_active,
+            "token_version": user.token_version,
+        },
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password, with a new hash when the stored one uses another cost."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+@functools.cache
+def _dummy_password_hash() -> str:
+    return pwd_context.hash(secrets.token_urlsafe(32))
+
+
+def verify_dummy_password(plain_password: str) -> bool:
+    """
+    Spend the same time as `verify_password` and fail, for unknown emails, so
+    response times don't tell which emails have an account.
+    """
+    pwd_context.verify(plain_password, _dummy_password_hash())
+    return False
@@ -0,0 +1,74 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+from app.schemas import TokenPayload
+
+
+class TokenCache:
+    """
+    Payloads of recently verified access tokens, keyed by a digest of the token.
+
+    An entry is served until the token's `exp`, so a token is only verified
+    and validated once per worker however many requests reuse it. Least
+    recently used entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, TokenPayload]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> TokenPayload | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, token: str, expires_at: float, payload: TokenPayload) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            size, hits, misses = len(self._entries), self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "pid": os.getpid(),
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
@@ -0,0 +1,107 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db import User
+
+
+class UserCache:
+    """
+    Column values of recently authenticated users, by id, for `ttl_seconds`.
+
+    Least recently used entries are evicted past `max_entries`. Routes that
+    change a user call `invalidate` after committing, which only reaches this
+    worker: other workers serve the old values until their TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        # Bumped by every invalidation, so a load that raced one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: uuid.UUID) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user: User, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        deadline = time.monotonic() + self.ttl_seconds
+        values = user.model_dump()
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user.id] = (deadline, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+
+
+async def get_cached_user(session: AsyncSession, user_id: uuid.UUID) -> User | None:
+    """
+    Load a user into `session`, from the cache when possible.
+
+    A cached user is merged without a query, as a persistent instance the route
+    can change and commit like one from `session.get`.
+    """
+    values = user_cache.get(user_id)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    generation = user_cache.generation
+    db_user = await session.get(User, user_id)
+    if db_user is not None:
+        user_cache.put(db_user, generation)
+    return db_user
+
+
+async def get_token_version(session: AsyncSession, user_id: uuid.UUID) -> int | None:
+    """Current token version of a user, None if the user doesn't exist."""
+    values = user_cache.get(user_id)
+    if values is not None:
+        return int(values["token_version"])
+    statement = select(User.token_version).where(User.id == user_id)
+    return (await session.exec(statement)).first()
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    """Drop a user from the cache, call after committing a change to them."""
+    user_cache.invalidate(user_id)
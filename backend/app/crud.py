@@ -1,25 +1,42 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlalchemy import Date, String, Uuid, func, insert, literal
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core import hashing
+from app.core.counts import CountMode, count_rows
+from app.core.pagination import paginate
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_dummy_password,
+)
+from app.core.user_cache import invalidate_user
 from app.db import (
     Attendance,
     Equipment,
     Event,
+    EventMealOption,
+    MealChoice,
     PackingEquipment,
     User,
 )
+from app.db.loaders import loader_options
 from app.schemas import (
     EquipmentCreate,
+    EventClone,
     EventCreate,
+    EventMealOptionTotals,
     EventUpdate,
     PackingEquipmentCreate,
+    PackingEquipmentPublic,
     UserCreate,
     UserUpdate,
 )
+from app.schemas.event_meal_option import EventMealOptionPublic
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -32,9 +49,19 @@ def create_user(*, session: Session, user_create: UserCreate) -> User:
     return db_obj
 
 
+def _bump_token_version(db_user: User, user_data: dict[str, Any]) -> dict[str, Any]:
+    """Revoke issued tokens when the claims they carry change."""
+    if any(
+        key in user_data and user_data[key] != getattr(db_user, key)
+        for key in ("role_type", "is_active")
+    ):
+        return {"token_version": User.token_version + 1}
+    return {}
+
+
 def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     user_data = user_in.model_dump(exclude_unset=True)
-    extra_data = {}
+    extra_data = _bump_token_version(db_user, user_data)
     if "password" in user_data:
         password = user_data["password"]
         hashed_password = get_password_hash(password)
@@ -42,6 +69,7 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
+    invalidate_user(db_user.id)
     session.refresh(db_user)
     return db_user
 
@@ -55,9 +83,75 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
+        verify_dummy_password(password)
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+        invalidate_user(db_user.id)
+    return db_user
+
+
+# Async variants used by the API routes. Password hashing is CPU bound, so it
+# runs on the bounded hashing pool instead of blocking the event loop.
+
+
+async def create_user_async(*, session: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await hashing.hash_password(user_create.password)
+    db_obj = User.model_validate(
+        user_create, update={"hashed_password": hashed_password}
+    )
+    session.add(db_obj)
+    await session.commit()
+    await session.refresh(db_obj)
+    return db_obj
+
+
+async def update_user_async(
+    *, session: AsyncSession, db_user: User, user_in: UserUpdate
+) -> Any:
+    user_data = user_in.model_dump(exclude_unset=True)
+    extra_data = _bump_token_version(db_user, user_data)
+    if "password" in user_data:
+        password = user_data["password"]
+        hashed_password = await hashing.hash_password(password)
+        extra_data["hashed_password"] = hashed_password
+    db_user.sqlmodel_update(user_data, update=extra_data)
+    session.add(db_user)
+    await session.commit()
+    invalidate_user(db_user.id)
+    await session.refresh(db_user)
+    return db_user
+
+
+async def get_user_by_email_async(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    session_user = (await session.exec(statement)).first()
+    return session_user
+
+
+async def authenticate_async(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    db_user = await get_user_by_email_async(session=session, email=email)
+    if not db_user:
+        await hashing.verify_dummy_password(password)
+        return None
+    verified, new_hash = await hashing.verify_and_update_password(
+        password, db_user.hashed_password
+    )
+    if not verified:
+        return None
+    if new_hash:
+        # Stored with an older bcrypt cost, upgrade it while the password is known
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
+        invalidate_user(db_user.id)
     return db_user
 
 
@@ -99,9 +193,98 @@ def delete_event(*, session: Session, event: Event) -> None:
     session.commit()
 
 
-def create_packing_equipment(
+def build_event(
+    event_in: EventCreate | EventUpdate,
+) -> tuple[Event, list[PackingEquipment], list[EventMealOption]]:
+    """
+    Rows for a new event and its children, not yet added to a session.
+
+    Ids are generated client side, so events added together are inserted one
+    table at a time in batched statements.
+    """
+    event = Event.model_validate(
+        event_in.model_dump(exclude={"packing_equipments", "meal_options"})
+    )
+    packing_equipments = [
+        PackingEquipment(event_id=event.id, **item.model_dump())
+        for item in event_in.packing_equipments or []
+    ]
+    meal_options = [
+        EventMealOption(event_id=event.id, **option.model_dump())
+        for option in event_in.meal_options or []
+    ]
+    return event, packing_equipments, meal_options
+
+
+async def clone_event(
+    *, session: AsyncSession, event_id: uuid.UUID, clone_in: EventClone
+) -> uuid.UUID | None:
+    """
+    Copy an event with its packing list and meal options using INSERT ...
+    SELECT, so no row leaves the database. The copy's dates move with
+    `clone_in.start_date`. Returns the new event's id, or None when the event
+    doesn't exist. The caller commits.
+    """
+    new_id = uuid.uuid4()
+    shift = (
+        literal(clone_in.start_date, Date) - col(Event.start_date)
+        if clone_in.start_date is not None
+        else literal(0)
+    )
+    columns = ["id", "name", "description", "start_date", "end_date"]
+    columns += ["coordinator_id", "version"]
+    cloned = await session.execute(
+        insert(Event)
+        .from_select(
+            columns,
+            sa_select(
+                literal(new_id, Uuid),
+                func.coalesce(literal(clone_in.name, String), col(Event.name)),
+                col(Event.description),
+                col(Event.start_date) + shift,
+                col(Event.end_date) + shift,
+                col(Event.coordinator_id),
+                literal(1),
+            ).where(Event.id == event_id),
+        )
+        # rowcount isn't kept for INSERT, so the missing event shows as no row
+        .returning(col(Event.id))
+    )
+    if cloned.scalar_one_or_none() is None:
+        return None
+
+    await session.execute(
+        insert(PackingEquipment).from_select(
+            ["id", "event_id", "equipment_id", "quantity", "required", "notes"],
+            sa_select(
+                func.uuid_generate_v4(),
+                literal(new_id, Uuid),
+                col(PackingEquipment.equipment_id),
+                col(PackingEquipment.quantity),
+                col(PackingEquipment.required),
+                col(PackingEquipment.notes),
+            ).where(PackingEquipment.event_id == event_id),
+        )
+    )
+    await session.execute(
+        insert(EventMealOption).from_select(
+            ["id", "event_id", "meal_id", "meal_type", "day", "max_quantity"],
+            sa_select(
+                func.uuid_generate_v4(),
+                literal(new_id, Uuid),
+                col(EventMealOption.meal_id),
+                col(EventMealOption.meal_type),
+                col(EventMealOption.day),
+                col(EventMealOption.max_quantity),
+            ).where(EventMealOption.event_id == event_id),
+        )
+    )
+    return new_id
+
+
+async def create_packing_equipment(
     *,
-    session: Session,
+    session: AsyncSession,
     event_id: uuid.UUID,
     equipment_id: uuid.UUID,
     packing_equipment_in: PackingEquipmentCreate,
@@ -112,42 +295,126 @@ def create_packing_equipment(
         equipment_id=equipment_id,
     )
     session.add(db_packing_equipment)
-    session.commit()
-    session.refresh(db_packing_equipment)
+    await session.commit()
+    await session.refresh(db_packing_equipment, ["equipment"])
     return db_packing_equipment
 
 
-def get_event_packing_equipments(
-    *, session: Session, event_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[PackingEquipment], int]:
+async def get_event_packing_equipments(
+    *,
+    session: AsyncSession,
+    event_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[PackingEquipment], int | None, str | None]:
     statement = (
         select(PackingEquipment)
         .where(PackingEquipment.event_id == event_id)
-        .offset(skip)
-        .limit(limit)
+        .options(*loader_options(PackingEquipmentPublic))
     )
-    equipments = list(session.exec(statement).all())
-    count = session.exec(
-        select(func.count())
-        .select_from(PackingEquipment)
-        .where(PackingEquipment.event_id == event_id)
-    ).one()
-    return equipments, count
+    equipments, next_cursor = await paginate(
+        session,
+        statement,
+        order_by=[PackingEquipment.id],  # type: ignore[list-item]
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    count = await count_rows(
+        session,
+        PackingEquipment,
+        PackingEquipment.event_id == event_id,  # type: ignore[arg-type]
+        mode=count_mode,
+    )
+    return equipments, count, next_cursor
 
 
-def get_event_attendees(
-    *, session: Session, event_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[Attendance], int]:
+async def get_packing_equipments_by_event(
+    *, session: AsyncSession, event_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, list[PackingEquipment]]:
+    """
+    The whole packing list of each event, with equipment, loaded in one query
+    for the rows plus one for their equipment however many events there are.
+    """
+    lists: dict[uuid.UUID, list[PackingEquipment]] = {id: [] for id in event_ids}
+    if not event_ids:
+        return lists
     statement = (
-        select(Attendance)
-        .where(Attendance.event_id == event_id)
-        .offset(skip)
-        .limit(limit)
-    )
-    attendees = list(session.exec(statement).all())
-    count = session.exec(
-        select(func.count())
-        .select_from(Attendance)
-        .where(Attendance.event_id == event_id)
-    ).one()
-    return attendees, count
+        select(PackingEquipment)
+        .where(col(PackingEquipment.event_id).in_(event_ids))
+        .options(*loader_options(PackingEquipmentPublic))
+        .order_by(col(PackingEquipment.id))
+    )
+    for packing_equipment in (await session.exec(statement)).all():
+        lists[packing_equipment.event_id].append(packing_equipment)
+    return lists
+
+
+async def get_event_attendees(
+    *,
+    session: AsyncSession,
+    event_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[Attendance], int | None, str | None]:
+    attendees, next_cursor = await paginate(
+        session,
+        select(Attendance).where(Attendance.event_id == event_id),
+        order_by=[Attendance.id],  # type: ignore[list-item]
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    count = await count_event_attendees(
+        session=session, event_id=event_id, count_mode=count_mode
+    )
+    return attendees, count, next_cursor
+
+
+async def count_event_attendees(
+    *,
+    session: AsyncSession,
+    event_id: uuid.UUID,
+    count_mode: CountMode = CountMode.EXACT,
+) -> int | None:
+    return await count_rows(
+        session,
+        Attendance,
+        Attendance.event_id == event_id,  # type: ignore[arg-type]
+        mode=count_mode,
+    )
+
+
+async def get_event_meal_option_totals(
+    *, session: AsyncSession, event_id: uuid.UUID
+) -> list[EventMealOptionTotals]:
+    """
+    An event's meal options with their meals, and how many meal choices each
+    has. The totals are one grouped query, whatever the number of choices.
+    """
+    statement = (
+        select(
+            EventMealOption,
+            func.count(col(MealChoice.id)),
+            func.coalesce(func.sum(MealChoice.quantity), 0),
+        )
+        .outerjoin(
+            MealChoice,
+            col(MealChoice.event_meal_option_id) == EventMealOption.id,
+        )
+        .where(EventMealOption.event_id == event_id)
+        .group_by(col(EventMealOption.id))
+        .order_by(col(EventMealOption.day), col(EventMealOption.id))
+        .options(*loader_options(EventMealOptionPublic))
+    )
+    rows = (await session.exec(statement)).all()
+    return [
+        EventMealOptionTotals.model_validate(
+            option, update={"choice_count": choices, "quantity_total": quantity}
+        )
+        for option, choices, quantity in rows
+    ]
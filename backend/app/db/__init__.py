@@ -1,3 +1,4 @@
+from . import versions  # noqa: F401  Registers the version bump listener
 from .tables import (
     Attendance,
     Equipment,
@@ -7,6 +8,7 @@ from .tables import (
     MealChoice,
     MealType,
     PackingEquipment,
+    RevokedToken,
     User,
 )
 
@@ -20,4 +22,5 @@ __all__ = [
     "MealChoice",
     "Attendance",
     "MealType",
+    "RevokedToken",
 ]
@@ -0,0 +1,33 @@
+"""
+Eager-loading options for response schemas that walk relationships.
+
+Responses are serialized after an async route returns, where lazy loads cannot
+run. Queries whose rows end up in one of these schemas add
+`*loader_options(Schema)`, which fetches every relationship the schema reads
+with one `SELECT ... IN` per level whatever the page size.
+"""
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import SQLModel
+
+from app.db.tables import Event, EventMealOption, PackingEquipment
+from app.schemas import EventPublic, PackingEquipmentPublic
+from app.schemas.event_meal_option import EventMealOptionPublic
+
+SCHEMA_LOADER_OPTIONS: dict[type[SQLModel], tuple[LoaderOption, ...]] = {
+    # EventPublic.packing_equipments[].equipment, EventPublic.meal_options[].meal
+    EventPublic: (
+        selectinload(Event.packing_equipments).selectinload(PackingEquipment.equipment),  # type: ignore[arg-type]
+        selectinload(Event.meal_options).selectinload(EventMealOption.meal),  # type: ignore[arg-type]
+    ),
+    # PackingEquipmentPublic.equipment
+    PackingEquipmentPublic: (selectinload(PackingEquipment.equipment),),  # type: ignore[arg-type]
+    # EventMealOptionPublic.meal
+    EventMealOptionPublic: (selectinload(EventMealOption.meal),),  # type: ignore[arg-type]
+}
+
+
+def loader_options(schema: type[SQLModel]) -> tuple[LoaderOption, ...]:
+    """Loader options needed to serialize query results as `schema`."""
+    return SCHEMA_LOADER_OPTIONS.get(schema, ())
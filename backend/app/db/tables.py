@@ -1,11 +1,15 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
+from sqlalchemy import Column, DateTime, UniqueConstraint, literal_column
 from sqlmodel import Field, Relationship, SQLModel
 
 from .enums import MealType, RoleType
 
+# Any UPDATE of a row with a version column bumps it, see app/db/versions.py
+VERSION_ONUPDATE = {"onupdate": literal_column("version + 1")}
+
 
 class User(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -14,10 +18,17 @@ class User(SQLModel, table=True):
     is_active: bool = True
     full_name: str | None = Field(default=None, max_length=255)
     role_type: RoleType = Field(default=RoleType.STUDENT)
+    # Bumped when role_type or is_active change, older tokens stop working
+    token_version: int = Field(default=0)
 
-    attendances: list["Attendance"] = Relationship(back_populates="user")
+    # The database deletes attendances and clears coordinator_id along with the
+    # user, so neither collection is loaded to delete it
+    attendances: list["Attendance"] = Relationship(
+        back_populates="user", cascade_delete=True, passive_deletes=True
+    )
     coordinated_events: list["Event"] = Relationship(
         back_populates="coordinator",
+        passive_deletes=True,
         sa_relationship_kwargs={"foreign_keys": "[Event.coordinator_id]"},
     )
 
@@ -28,6 +39,7 @@ class Equipment(SQLModel, table=True):
     description: str | None = Field(default=None, max_length=255)
     category: str = Field(default=None, max_length=100)
     location: str = Field(default=None, max_length=100)
+    version: int = Field(default=1, sa_column_kwargs=VERSION_ONUPDATE)
 
     event_equipments: list["PackingEquipment"] = Relationship(
         back_populates="equipment"
@@ -38,22 +50,28 @@ class Event(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(max_length=255)
     description: str | None = Field(default=None, max_length=1000)
-    start_date: str = Field(max_length=10)  # Format: YYYY-MM-DD
-    end_date: str = Field(max_length=10)
-    coordinator_id: UUID = Field(foreign_key="user.id", nullable=True)
+    # Lists page through start_date, and overlap filters bound both dates
+    start_date: date = Field(index=True)
+    end_date: date = Field(index=True)
+    coordinator_id: UUID | None = Field(
+        default=None, foreign_key="user.id", index=True, ondelete="SET NULL"
+    )
+    # Also bumped when anything EventPublic nests changes
+    version: int = Field(default=1, sa_column_kwargs=VERSION_ONUPDATE)
 
-    coordinator: User = Relationship(
+    coordinator: User | None = Relationship(
         back_populates="coordinated_events",
         sa_relationship_kwargs={"foreign_keys": "[Event.coordinator_id]"},
     )
+    # Deleted by the database along with the event, without being loaded
     attendees: list["Attendance"] = Relationship(
-        back_populates="event", cascade_delete=True
+        back_populates="event", cascade_delete=True, passive_deletes=True
     )
     packing_equipments: list["PackingEquipment"] = Relationship(
-        back_populates="event", cascade_delete=True
+        back_populates="event", cascade_delete=True, passive_deletes=True
     )
     meal_options: list["EventMealOption"] = Relationship(
-        back_populates="event", cascade_delete=True
+        back_populates="event", cascade_delete=True, passive_deletes=True
     )
 
 
@@ -66,25 +84,30 @@ class Meal(SQLModel, table=True):
     is_vegetarian: bool = False
     is_beef: bool = False
     calories: int | None = None
+    version: int = Field(default=1, sa_column_kwargs=VERSION_ONUPDATE)
     event_meal_options: list["EventMealOption"] = Relationship(back_populates="meal")
 
 
 class EventMealOption(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     meal_id: UUID = Field(foreign_key="meal.id")
-    event_id: UUID = Field(foreign_key="event.id")
+    event_id: UUID = Field(foreign_key="event.id", index=True, ondelete="CASCADE")
     meal_type: MealType
     day: int
     max_quantity: int | None = None
 
     event: Event = Relationship(back_populates="meal_options")
     meal: Meal = Relationship(back_populates="event_meal_options")
-    meal_choices: list["MealChoice"] = Relationship(back_populates="event_meal_option")
+    meal_choices: list["MealChoice"] = Relationship(
+        back_populates="event_meal_option", cascade_delete=True, passive_deletes=True
+    )
 
 
 class PackingEquipment(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    event_id: UUID = Field(foreign_key="event.id", nullable=False)
+    event_id: UUID = Field(
+        foreign_key="event.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     equipment_id: UUID = Field(foreign_key="equipment.id", nullable=False)
     quantity: int = Field(default=1)
     required: bool = Field(default=True)
@@ -95,9 +118,20 @@ class PackingEquipment(SQLModel, table=True):
 
 
 class MealChoice(SQLModel, table=True):
+    # Also serves lookups by attendance_id, its leading column
+    __table_args__ = (
+        UniqueConstraint(
+            "attendance_id",
+            "event_meal_option_id",
+            name="uq_mealchoice_attendance_id_event_meal_option_id",
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    attendance_id: UUID = Field(foreign_key="attendance.id")
-    event_meal_option_id: UUID = Field(foreign_key="eventmealoption.id")
+    attendance_id: UUID = Field(foreign_key="attendance.id", ondelete="CASCADE")
+    event_meal_option_id: UUID = Field(
+        foreign_key="eventmealoption.id", index=True, ondelete="CASCADE"
+    )
     quantity: int = 1
     notes: str | None = None
 
@@ -106,14 +140,44 @@ class MealChoice(SQLModel, table=True):
 
 
 class Attendance(SQLModel, table=True):
+    # Also serves lookups by user_id, its leading column
+    __table_args__ = (
+        UniqueConstraint("user_id", "event_id", name="uq_attendance_user_id_event_id"),
+    )
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: UUID = Field(foreign_key="user.id", nullable=False)
-    event_id: UUID = Field(foreign_key="event.id", nullable=False)
+    user_id: UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    event_id: UUID = Field(
+        foreign_key="event.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     is_attending: bool = Field(default=True)
 
     user: User = Relationship(back_populates="attendances")
     event: Event = Relationship(back_populates="attendees")
-    meal_choices: list[MealChoice] = Relationship(back_populates="attendance")
+    meal_choices: list[MealChoice] = Relationship(
+        back_populates="attendance", cascade_delete=True, passive_deletes=True
+    )
+
+
+class RevokedToken(SQLModel, table=True):
+    """
+    An access token, or every token of a user, revoked before expiring.
+
+    Workers keep these in memory and poll for new rows by `revoked_at`.
+    """
+
+    id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    # SHA-256 of one revoked token, set by logout
+    token_digest: str | None = Field(default=None, max_length=64)
+    # Revokes every token of this user issued up to revoked_at
+    user_id: UUID | None = Field(default=None)
+    revoked_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+    # The revoked tokens have all expired by then, and the row can be deleted
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
 
 
 class Course(SQLModel, table=True):
@@ -134,5 +198,6 @@ __all__ = [
     "MealChoice",
     "Attendance",
     "MealType",
+    "RevokedToken",
     "Course",
 ]
@@ -0,0 +1,87 @@
+"""
+Row versions behind the ETags of event, meal and equipment reads.
+
+Event, Meal and Equipment rows bump their own `version` in every UPDATE. An
+event's version also covers everything EventPublic nests, so it is bumped when
+its packing list or meal options change, or when an equipment or meal they
+reference is updated, or its coordinator is deleted. Conditional reads then
+only need the event row.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.orm import Session, UOWTransaction
+from sqlmodel import col
+
+from app.db.tables import (
+    Equipment,
+    Event,
+    EventMealOption,
+    Meal,
+    PackingEquipment,
+    User,
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_coordinated_event_versions(
+    session: Session, _flush_context: UOWTransaction, _instances: Any
+) -> None:
+    # Deleting a user clears coordinator_id on their events in the database,
+    # which no onupdate sees, and the events can't be found once it's done
+    user_ids = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    if user_ids:
+        session.connection().execute(
+            update(Event.__table__)  # type: ignore[arg-type]
+            .where(Event.__table__.c.coordinator_id.in_(user_ids))  # type: ignore[attr-defined]
+            .values(version=Event.__table__.c.version + 1)  # type: ignore[attr-defined]
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_event_versions(session: Session, _flush_context: UOWTransaction) -> None:
+    event_ids: set[UUID] = set()
+    equipment_ids: set[UUID] = set()
+    meal_ids: set[UUID] = set()
+    new_event_ids = {obj.id for obj in session.new if isinstance(obj, Event)}
+
+    changed: list[Any] = [*session.new, *session.deleted]
+    changed += [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in changed:
+        if isinstance(obj, PackingEquipment | EventMealOption):
+            if obj.event_id not in new_event_ids:
+                event_ids.add(obj.event_id)
+        elif isinstance(obj, Equipment) and obj in session.dirty:
+            equipment_ids.add(obj.id)
+        elif isinstance(obj, Meal) and obj in session.dirty:
+            meal_ids.add(obj.id)
+
+    criteria = []
+    if event_ids:
+        criteria.append(col(Event.id).in_(event_ids))
+    if equipment_ids:
+        criteria.append(
+            col(Event.id).in_(
+                select(PackingEquipment.event_id).where(
+                    col(PackingEquipment.equipment_id).in_(equipment_ids)
+                )
+            )
+        )
+    if meal_ids:
+        criteria.append(
+            col(Event.id).in_(
+                select(EventMealOption.event_id).where(
+                    col(EventMealOption.meal_id).in_(meal_ids)
+                )
+            )
+        )
+    if criteria:
+        # One statement per flush, on the connection so the identity map and
+        # the events' own onupdate are left alone
+        session.connection().execute(
+            update(Event.__table__)  # type: ignore[arg-type]
+            .where(or_(*criteria))
+            .values(version=Event.__table__.c.version + 1)  # type: ignore[attr-defined]
+        )
@@ -0,0 +1,224 @@
+"""
+Bulk event import from a CSV or NDJSON upload, read as it streams in.
+
+Rows are handled in batches of EVENT_IMPORT_BATCH_SIZE. The equipment, meals
+and coordinators a batch references are checked with one query per table,
+against ids remembered from earlier batches. The batch's valid events are then
+inserted with their children and committed together. A bad row is reported
+with its line and skipped, and the rest of the upload still goes in.
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db import Equipment, Event, EventMealOption, Meal, PackingEquipment, User
+from app.schemas import EventCreate, EventImportError, EventImportResult
+
+CSV = "text/csv"
+NDJSON = "application/x-ndjson"
+FORMATS = (CSV, NDJSON)
+# CSV cells holding a JSON array of an event's children
+NESTED_COLUMNS = ("packing_equipments", "meal_options")
+
+EventRows = tuple[Event, list[PackingEquipment], list[EventMealOption]]
+# A row that validated: its line, input and the rows built from it
+ImportRow = tuple[int, EventCreate, EventRows]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Numbered lines of a UTF-8 byte stream, without line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    number = 0
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            number += 1
+            yield number, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield number + 1, pending.rstrip("\r")
+
+
+def parse_csv_row(header: list[str], line: str) -> dict[str, Any]:
+    """
+    A CSV line as event fields. Empty cells are None, and the children columns
+    hold JSON arrays. Quoted values can't span lines.
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+    row: dict[str, Any] = {
+        name: value or None for name, value in zip(header, values, strict=True)
+    }
+    for name in NESTED_COLUMNS:
+        if row.get(name) is not None:
+            row[name] = json.loads(row[name])
+    return row
+
+
+def error_messages(error: ValueError) -> list[str]:
+    if isinstance(error, ValidationError):
+        return [
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        ]
+    return [str(error)]
+
+
+@dataclass
+class KnownIds:
+    """Ids of one table found, or found missing, earlier in an import."""
+
+    model: type[Equipment | Meal | User]
+    found: set[UUID] = field(default_factory=set)
+    missing: set[UUID] = field(default_factory=set)
+
+    async def load(self, session: AsyncSession, ids: set[UUID]) -> None:
+        """Look up the ids not seen before, in a single query."""
+        unknown = ids - self.found - self.missing
+        if not unknown:
+            return
+        statement = select(self.model.id).where(col(self.model.id).in_(unknown))
+        found = set((await session.exec(statement)).all())
+        self.found |= found
+        self.missing |= unknown - found
+
+
+@dataclass
+class EventImporter:
+    session: AsyncSession
+    equipments: KnownIds = field(default_factory=lambda: KnownIds(Equipment))
+    meals: KnownIds = field(default_factory=lambda: KnownIds(Meal))
+    coordinators: KnownIds = field(default_factory=lambda: KnownIds(User))
+    created: int = 0
+    errors: list[EventImportError] = field(default_factory=list)
+
+    def fail(self, line: int, errors: list[str]) -> None:
+        self.errors.append(EventImportError(line=line, errors=errors))
+
+    def missing_ids(self, event_in: EventCreate) -> list[str]:
+        errors = [
+            f"equipment with id {item.equipment_id} not found"
+            for item in event_in.packing_equipments or []
+            if item.equipment_id in self.equipments.missing
+        ]
+        errors += [
+            f"Meal with id {option.meal_id} not found"
+            for option in event_in.meal_options or []
+            if option.meal_id in self.meals.missing
+        ]
+        if event_in.coordinator_id in self.coordinators.missing:
+            errors.append(f"User with id {event_in.coordinator_id} not found")
+        return errors
+
+    async def insert(self, batch: list[ImportRow]) -> None:
+        """Check a batch's references, then insert its valid events at once."""
+        events_in = [event_in for _, event_in, _ in batch]
+        await self.equipments.load(
+            self.session,
+            {
+                item.equipment_id
+                for event_in in events_in
+                for item in event_in.packing_equipments or []
+            },
+        )
+        await self.meals.load(
+            self.session,
+            {
+                option.meal_id
+                for event_in in events_in
+                for option in event_in.meal_options or []
+            },
+        )
+        await self.coordinators.load(
+            self.session,
+            {
+                event_in.coordinator_id
+                for event_in in events_in
+                if event_in.coordinator_id is not None
+            },
+        )
+
+        valid = []
+        for line, event_in, rows in batch:
+            if errors := self.missing_ids(event_in):
+                self.fail(line, errors)
+            else:
+                valid.append((line, event_in, rows))
+        if not valid:
+            return
+
+        try:
+            await self.commit([rows for _, _, rows in valid])
+        except DBAPIError:
+            await self.session.rollback()
+            # One bad row fails the whole batch, so find it one row at a time.
+            # The rolled back rows are rebuilt rather than added again.
+            for line, event_in, _ in valid:
+                try:
+                    await self.commit([crud.build_event(event_in)])
+                except DBAPIError:
+                    await self.session.rollback()
+                    self.fail(line, ["Event could not be saved"])
+
+    async def commit(self, events: list[EventRows]) -> None:
+        for event, packing_equipments, meal_options in events:
+            self.session.add(event)
+            self.session.add_all(packing_equipments)
+            self.session.add_all(meal_options)
+        await self.session.commit()
+        # Nothing is read back, so the batch needn't stay in memory
+        self.session.expunge_all()
+        self.created += len(events)
+
+
+async def import_events(
+    session: AsyncSession, chunks: AsyncIterable[bytes], content_type: str
+) -> EventImportResult:
+    """
+    Create the events in a CSV or NDJSON byte stream. CSV needs a header row
+    naming EventCreate fields, NDJSON has one EventCreate object per line.
+    """
+    importer = EventImporter(session)
+    header: list[str] | None = None
+    batch: list[ImportRow] = []
+    async for line, text in iter_lines(chunks):
+        if not text.strip():
+            continue
+        if content_type == CSV and header is None:
+            header = next(csv.reader([text]))
+            continue
+        try:
+            row = (
+                parse_csv_row(header, text) if header is not None else json.loads(text)
+            )
+            event_in = EventCreate.model_validate(row)
+            # The table model validates again, which EventCreate alone can pass
+            batch.append((line, event_in, crud.build_event(event_in)))
+        except ValueError as error:
+            importer.fail(line, error_messages(error))
+            continue
+        if len(batch) >= settings.EVENT_IMPORT_BATCH_SIZE:
+            await importer.insert(batch)
+            batch = []
+    if batch:
+        await importer.insert(batch)
+
+    return EventImportResult(
+        created=importer.created,
+        failed=len(importer.errors),
+        errors=sorted(importer.errors, key=lambda error: error.line),
+    )
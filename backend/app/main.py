@@ -1,10 +1,25 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRoute
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import async_engine
+from app.core.query_stats import track_queries
+from app.core.revocation import (
+    purge_expired_revocations,
+    refresh_revocations_forever,
+    revocation_list,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,8 +29,26 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    async with AsyncSession(async_engine) as session:
+        await purge_expired_revocations(session)
+        await revocation_list.refresh(session)
+    refresher = asyncio.create_task(
+        refresh_revocations_forever(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+    )
+    yield
+    refresher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await refresher
+    # Pooled async connections are bound to the event loop that opened them
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -30,4 +63,23 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+
+@app.middleware("http")
+async def report_query_stats(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers["X-Query-Count"] = str(stats.count)
+    response.headers["Server-Timing"] = f"db;dur={stats.duration_ms:.1f}"
+    logger.debug(
+        "%s %s ran %d queries in %.1f ms",
+        request.method,
+        request.url.path,
+        stats.count,
+        stats.duration_ms,
+    )
+    return response
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -19,13 +19,18 @@ from .equipment import (
 )
 from .event import (
     EventBase,
+    EventClone,
     EventCreate,
+    EventImportError,
+    EventImportResult,
+    EventOverview,
     EventPublic,
     EventsPublic,
     EventUpdate,
 )
 from .event_meal_option import (
     EventMealOptionCreate,
+    EventMealOptionTotals,
 )
 from .meal import (
     MealBase,
@@ -41,6 +46,13 @@ from .packing import (
     PackingEquipmentsPublic,
     PackingEquipmentUpdate,
 )
+from .pool import (
+    PasswordHashingStatus,
+    PoolsStatus,
+    PoolStatus,
+    PoolWaitTime,
+    TokenCacheStatus,
+)
 from .user import (
     UserBase,
     UserCreate,
@@ -75,8 +87,12 @@ __all__ = [
     # Event schemas
     "EventBase",
     "EventCreate",
+    "EventClone",
     "EventUpdate",
+    "EventImportError",
+    "EventImportResult",
     "EventPublic",
+    "EventOverview",
     "EventsPublic",
     # Meal schemas
     "MealBase",
@@ -90,10 +106,17 @@ __all__ = [
     "PackingEquipmentPublic",
     "PackingEquipmentsPublic",
     "EventPackingList",
+    # Pool schemas
+    "PoolWaitTime",
+    "PoolStatus",
+    "PoolsStatus",
+    "PasswordHashingStatus",
+    "TokenCacheStatus",
     # Attendance schemas
     "MealChoiceCreateBase",
     "MealChoiceCreate",
     "MealChoiceUpdate",
     # Event Meal Option schemas
     "EventMealOptionCreate",
+    "EventMealOptionTotals",
 ]
@@ -1,5 +1,7 @@
 from sqlmodel import Field, SQLModel
 
+from app.db.enums import RoleType
+
 
 class Token(SQLModel):
     access_token: str
@@ -8,6 +10,12 @@ class Token(SQLModel):
 
 class TokenPayload(SQLModel):
     sub: str | None = None
+    # Absent from tokens issued before these claims were added
+    role_type: RoleType | None = None
+    is_active: bool | None = None
+    token_version: int | None = None
+    iat: int | None = None
+    exp: int | None = None
 
 
 class NewPassword(SQLModel):
@@ -26,4 +26,6 @@ class EquipmentPublic(EquipmentBase):
 
 class EquipmentsPublic(SQLModel):
     data: list[EquipmentPublic]
-    count: int
+    # None when the client passed ?count=none
+    count: int | None
+    next_cursor: str | None = None
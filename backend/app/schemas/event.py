@@ -1,16 +1,25 @@
+from datetime import date
 from uuid import UUID
 
 from sqlmodel import Field, SQLModel
 
-from .event_meal_option import EventMealOptionCreate, EventMealOptionPublic
-from .packing import PackingEquipmentCreate, PackingEquipmentPublic
+from .event_meal_option import (
+    EventMealOptionCreate,
+    EventMealOptionPublic,
+    EventMealOptionTotals,
+)
+from .packing import (
+    PackingEquipmentCreate,
+    PackingEquipmentPublic,
+    PackingEquipmentsPublic,
+)
 
 
 class EventBase(SQLModel):
     name: str = Field(max_length=255)
     description: str | None = Field(default=None, max_length=1000)
-    start_date: str = Field(max_length=10)  # Format: YYYY-MM-DD
-    end_date: str = Field(max_length=10)
+    start_date: date  # Format: YYYY-MM-DD
+    end_date: date
     coordinator_id: UUID | None = Field(foreign_key="user.id")
 
 
@@ -22,30 +31,51 @@ class EventCreate(EventBase):
 class EventUpdate(SQLModel):
     name: str | None = Field(default=None)
     description: str | None = Field(default=None)
-    start_date: str | None = Field(default=None)
-    end_date: str | None = Field(default=None)
+    start_date: date | None = Field(default=None)
+    end_date: date | None = Field(default=None)
     coordinator_id: UUID | None = Field(foreign_key="user.id")
     packing_equipments: list[PackingEquipmentCreate] | None = None
     meal_options: list[EventMealOptionCreate] | None = None
 
 
+class EventClone(SQLModel):
+    # Defaults to the original event's name
+    name: str | None = Field(default=None, max_length=255)
+    # The copy starts on this day and its end date moves by as many days.
+    # Defaults to the original dates
+    start_date: date | None = None
+
+
 class EventPublic(EventBase):
     id: UUID
     packing_equipments: list[PackingEquipmentPublic]
     meal_options: list[EventMealOptionPublic]
 
 
+class EventOverview(EventBase):
+    """Everything an event page shows, in one response."""
+
+    id: UUID
+    packing_equipments: PackingEquipmentsPublic
+    meal_options: list[EventMealOptionTotals]
+    # None when the client passed ?count=none
+    attendee_count: int | None
+
+
 class EventsPublic(SQLModel):
     data: list[EventPublic]
-    count: int
+    # None when the client passed ?count=none
+    count: int | None
+    next_cursor: str | None = None
 
 
-class PackingEquipmentsPublic(SQLModel):
-    data: list[PackingEquipmentPublic]
-    count: int
+class EventImportError(SQLModel):
+    # Line of the upload the row came from, counting a CSV header as line 1
+    line: int
+    errors: list[str]
 
 
-class EventPackingList(SQLModel):
-    event_id: UUID
-    event_name: str
-    equipments: PackingEquipmentsPublic
+class EventImportResult(SQLModel):
+    created: int
+    failed: int
+    errors: list[EventImportError]
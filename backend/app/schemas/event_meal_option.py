@@ -22,3 +22,9 @@ class EventMealOptionCreate(EventMealOptionCreateBase):
 class EventMealOptionPublic(EventMealOptionCreateBase):
     id: UUID
     meal: MealPublic
+
+
+class EventMealOptionTotals(EventMealOptionPublic):
+    # Meal choices students made for this option, and their summed quantity
+    choice_count: int
+    quantity_total: int
@@ -26,7 +26,9 @@ class PackingEquipmentPublic(PackingEquipmentBase):
 
 class PackingEquipmentsPublic(SQLModel):
     data: list[PackingEquipmentPublic]
-    count: int
+    # None when the client passed ?count=none
+    count: int | None
+    next_cursor: str | None = None
 
 
 class EventPackingList(SQLModel):
@@ -0,0 +1,44 @@
+from sqlmodel import SQLModel
+
+
+class PoolWaitTime(SQLModel):
+    count: int
+    total_ms: float
+    max_ms: float
+    buckets: dict[str, int]
+
+
+class PoolStatus(SQLModel):
+    name: str
+    pid: int
+    pool_class: str
+    size: int | None = None
+    checked_out: int | None = None
+    idle: int | None = None
+    overflow: int | None = None
+    wait_time: PoolWaitTime | None = None
+
+
+class PoolsStatus(SQLModel):
+    data: list[PoolStatus]
+    count: int
+
+
+class PasswordHashingStatus(SQLModel):
+    pid: int
+    workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    wait_time: PoolWaitTime
+
+
+class TokenCacheStatus(SQLModel):
+    pid: int
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_rate: float | None = None
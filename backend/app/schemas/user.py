@@ -44,7 +44,9 @@ class UserPublic(UserBase):
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    # None when the client passed ?count=none
+    count: int | None
+    next_cursor: str | None = None
 
 
 class Token(SQLModel):
@@ -0,0 +1,281 @@
+import argparse
+import logging
+import secrets
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import Connection, Table, text
+
+from app.core.db import engine
+from app.core.security import get_password_hash
+from app.db import (
+    Attendance,
+    Equipment,
+    Event,
+    EventMealOption,
+    Meal,
+    MealChoice,
+    MealType,
+    PackingEquipment,
+    User,
+)
+from app.db.enums import RoleType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "seed-password"
+# Every STAFF_EVERY-th user is staff and coordinates events, the rest are students
+STAFF_EVERY = 50
+FIRST_EVENT_DATE = date(2024, 1, 1)
+
+Row = dict[str, Any]
+
+
+@dataclass
+class SeedVolumes:
+    users: int = 1_000
+    events: int = 100
+    equipments: int = 500
+    meals: int = 200
+    attendances: int = 10_000
+    meal_choices: int = 20_000
+    packing_per_event: int = 10
+    meal_options_per_event: int = 6
+
+    def validate(self) -> None:
+        """Fail before loading anything if the unique constraints can't hold."""
+        if min(self.users, self.events, self.equipments, self.meals) < 1:
+            raise ValueError("users, events, equipments and meals must be positive")
+        if self.packing_per_event > self.equipments:
+            raise ValueError("packing_per_event can't exceed equipments")
+        if self.attendances > self.users * self.events:
+            raise ValueError("each user attends an event at most once")
+        if self.meal_choices > self.attendances * self.meal_options_per_event:
+            raise ValueError("each attendance picks a meal option at most once")
+
+
+class SeedIds:
+    """
+    Deterministic ids for one run, so rows can reference each other without
+    keeping millions of generated ids in memory.
+    """
+
+    USER, EVENT, EQUIPMENT, MEAL, PACKING, MEAL_OPTION, ATTENDANCE, MEAL_CHOICE = range(
+        1, 9
+    )
+
+    def __init__(self, run: int) -> None:
+        self.run = run
+
+    def __call__(self, kind: int, n: int) -> uuid.UUID:
+        return uuid.UUID(int=(self.run << 64) | (kind << 40) | n, version=4)
+
+
+def copy_rows(connection: Connection, table: Table, rows: Iterable[Row]) -> int:
+    """
+    Stream `rows` into `table` with COPY FROM STDIN.
+
+    Values go through each column's bind processor, like an ORM insert would,
+    and missing keys take the column's scalar default.
+    """
+    columns = list(table.columns)
+    processors = [column.type.bind_processor(connection.dialect) for column in columns]
+    defaults = [
+        column.default.arg  # type: ignore[attr-defined]
+        if column.default is not None and column.default.is_scalar
+        else None
+        for column in columns
+    ]
+    preparer = connection.dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column.name) for column in columns)
+    statement = f"COPY {preparer.quote(table.name)} ({column_list}) FROM STDIN"
+
+    count = 0
+    driver_connection: Any = connection.connection.driver_connection
+    with driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in rows:
+            values = []
+            for column, processor, default in zip(
+                columns, processors, defaults, strict=True
+            ):
+                value = row.get(column.name, default)
+                values.append(processor(value) if processor else value)
+            copy.write_row(values)
+            count += 1
+    return count
+
+
+def generate_users(ids: SeedIds, volumes: SeedVolumes, tag: str) -> Iterator[Row]:
+    # Hashing once keeps 200k users in seconds, they all share the password
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    for n in range(volumes.users):
+        yield {
+            "id": ids(ids.USER, n),
+            "email": f"{tag}-{n}@example.com",
+            "hashed_password": hashed_password,
+            "full_name": f"Seed User {n}",
+            "role_type": RoleType.STAFF if n % STAFF_EVERY == 0 else RoleType.STUDENT,
+        }
+
+
+def generate_equipments(ids: SeedIds, volumes: SeedVolumes, tag: str) -> Iterator[Row]:
+    for n in range(volumes.equipments):
+        yield {
+            "id": ids(ids.EQUIPMENT, n),
+            "title": f"{tag} equipment {n}",
+            "category": f"Category {n % 20}",
+            "location": f"Shelf {n % 100}",
+        }
+
+
+def generate_meals(ids: SeedIds, volumes: SeedVolumes, tag: str) -> Iterator[Row]:
+    for n in range(volumes.meals):
+        yield {
+            "id": ids(ids.MEAL, n),
+            "name": f"{tag} meal {n}",
+            "restaurant": f"Restaurant {n % 25}",
+            "price": 5.0 + n % 20,
+            "is_vegetarian": n % 3 == 0,
+            "is_beef": n % 3 == 1,
+            "calories": 400 + n % 600,
+        }
+
+
+def generate_events(ids: SeedIds, volumes: SeedVolumes, tag: str) -> Iterator[Row]:
+    coordinators = max(volumes.users // STAFF_EVERY, 1)
+    for n in range(volumes.events):
+        start = FIRST_EVENT_DATE + timedelta(days=(n * 3) % 730)
+        yield {
+            "id": ids(ids.EVENT, n),
+            "name": f"{tag} event {n}",
+            "start_date": start,
+            "end_date": start + timedelta(days=2),
+            "coordinator_id": ids(ids.USER, (n % coordinators) * STAFF_EVERY),
+        }
+
+
+def generate_packing_equipments(
+    ids: SeedIds, volumes: SeedVolumes, _tag: str
+) -> Iterator[Row]:
+    per_event = volumes.packing_per_event
+    for event in range(volumes.events):
+        for j in range(per_event):
+            yield {
+                "id": ids(ids.PACKING, event * per_event + j),
+                "event_id": ids(ids.EVENT, event),
+                "equipment_id": ids(
+                    ids.EQUIPMENT, (event * per_event + j) % volumes.equipments
+                ),
+                "quantity": 1 + j % 3,
+            }
+
+
+def generate_meal_options(
+    ids: SeedIds, volumes: SeedVolumes, _tag: str
+) -> Iterator[Row]:
+    per_event = volumes.meal_options_per_event
+    meal_types = list(MealType)
+    for event in range(volumes.events):
+        for j in range(per_event):
+            yield {
+                "id": ids(ids.MEAL_OPTION, event * per_event + j),
+                "event_id": ids(ids.EVENT, event),
+                "meal_id": ids(ids.MEAL, (event * per_event + j) % volumes.meals),
+                "meal_type": meal_types[j % len(meal_types)],
+                "day": j // len(meal_types) + 1,
+            }
+
+
+def generate_attendances(
+    ids: SeedIds, volumes: SeedVolumes, _tag: str
+) -> Iterator[Row]:
+    # Attendance n is the (n // events)-th attendee of event n % events, which
+    # keeps (user_id, event_id) unique
+    for n in range(volumes.attendances):
+        event, position = n % volumes.events, n // volumes.events
+        yield {
+            "id": ids(ids.ATTENDANCE, n),
+            "user_id": ids(ids.USER, (event + position) % volumes.users),
+            "event_id": ids(ids.EVENT, event),
+        }
+
+
+def generate_meal_choices(
+    ids: SeedIds, volumes: SeedVolumes, _tag: str
+) -> Iterator[Row]:
+    # Choice n is the (n // attendances)-th option of its attendance's event,
+    # which keeps (attendance_id, event_meal_option_id) unique
+    for n in range(volumes.meal_choices):
+        attendance, position = n % volumes.attendances, n // volumes.attendances
+        event = attendance % volumes.events
+        yield {
+            "id": ids(ids.MEAL_CHOICE, n),
+            "attendance_id": ids(ids.ATTENDANCE, attendance),
+            "event_meal_option_id": ids(
+                ids.MEAL_OPTION, event * volumes.meal_options_per_event + position
+            ),
+        }
+
+
+# Parents before children, so foreign keys hold after every table
+GENERATORS: list[
+    tuple[type[Any], Callable[[SeedIds, SeedVolumes, str], Iterator[Row]]]
+] = [
+    (User, generate_users),
+    (Equipment, generate_equipments),
+    (Meal, generate_meals),
+    (Event, generate_events),
+    (PackingEquipment, generate_packing_equipments),
+    (EventMealOption, generate_meal_options),
+    (Attendance, generate_attendances),
+    (MealChoice, generate_meal_choices),
+]
+
+
+def seed(volumes: SeedVolumes, run: int | None = None) -> str:
+    """Bulk load `volumes` rows, returns the tag in the seeded emails and names."""
+    volumes.validate()
+    if run is None:
+        run = secrets.randbits(64)
+    ids = SeedIds(run)
+    tag = f"seed-{run:016x}"
+    with engine.connect() as connection:
+        for model, generate in GENERATORS:
+            table: Table = model.__table__
+            start = time.perf_counter()
+            count = copy_rows(connection, table, generate(ids, volumes, tag))
+            connection.commit()
+            logger.info(
+                "Copied %d rows into %s in %.1fs",
+                count,
+                table.name,
+                time.perf_counter() - start,
+            )
+        # Fresh statistics for the planner, and for ?count=estimate
+        for model, _ in GENERATORS:
+            connection.execute(text(f'ANALYZE "{model.__table__.name}"'))
+        connection.commit()
+    return tag
+
+
+def main() -> None:
+    defaults = SeedVolumes()
+    parser = argparse.ArgumentParser(
+        description="Bulk load synthetic data for scale testing"
+    )
+    for name, default in vars(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args()
+
+    logger.info("Seeding data")
+    tag = seed(SeedVolumes(**vars(args)))
+    logger.info("Seeded data tagged %s, users log in with %r", tag, SEED_PASSWORD)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
+from datetime import date
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app.core.config import settings
+from app.db import PackingEquipment
 from app.tests.utils.attendance import (
     clean_attendance_tables,
     create_attendance_with_packing_equipments,
     create_random_attendance,
 )
+from app.tests.utils.equipment import create_random_equipment
 from app.tests.utils.event import create_random_event
-from app.tests.utils.utils import get_user_id_from_token
+from app.tests.utils.utils import assert_query_budget, get_user_id_from_token
 
 
 def test_join_event(
@@ -83,6 +87,8 @@ def test_get_my_events(
     assert response.status_code == 200
     events = response.json()
     assert len(events) >= 2
+    # user, events, packing equipments, equipments, meal options, meals
+    assert_query_budget(response, 6)
     # Verify event structure
     for event in events:
         assert "id" in event
@@ -92,6 +98,36 @@ def test_get_my_events(
         assert "end_date" in event
 
 
+def test_get_my_events_pages_by_start_date(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    clean_attendance_tables(db)
+    user_id = get_user_id_from_token(client, student_token_headers)
+    events = [
+        create_random_event(
+            db, start_date=date(2031, 5, day), end_date=date(2031, 5, day)
+        )
+        for day in (3, 1, 2)
+    ]
+    for event in events:
+        create_random_attendance(db, user_id=user_id, event_id=event.id)
+    expected = [str(event.id) for event in sorted(events, key=lambda e: e.start_date)]
+
+    seen = []
+    params: dict[str, str | int] = {"limit": 1}
+    for _ in expected:
+        response = client.get(
+            f"{settings.API_V1_STR}/attendance/my-events",
+            headers=student_token_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        seen += [event["id"] for event in response.json()]
+        params["cursor"] = response.headers.get("X-Next-Cursor", "")
+    assert seen == expected
+    assert params["cursor"] == ""
+
+
 def test_get_event_packing_list(
     client: TestClient, student_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -110,6 +146,8 @@ def test_get_event_packing_list(
     assert "count" in content
     assert content["count"] >= 1
     assert len(content["data"]) >= 1
+    # user, event, attendance, packing equipments, equipments, count
+    assert_query_budget(response, 6)
     # Verify packing item structure
     equipment_data = content["data"][0]
     assert "equipment" in equipment_data
@@ -117,6 +155,33 @@ def test_get_event_packing_list(
     assert "required" in equipment_data
 
 
+def test_get_event_packing_list_etag(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    user_id = get_user_id_from_token(client, student_token_headers)
+    attendance = create_attendance_with_packing_equipments(
+        db, user_id=user_id, num_equipments=2
+    )
+    url = f"{settings.API_V1_STR}/attendance/{attendance.event_id}/packing-list"
+    etag = client.get(url, headers=student_token_headers).headers["ETag"]
+
+    response = client.get(url, headers={**student_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    # user, event, attendance
+    assert_query_budget(response, 3)
+
+    db.add(
+        PackingEquipment(
+            event_id=attendance.event_id,
+            equipment_id=create_random_equipment(db).id,
+        )
+    )
+    db.commit()
+    response = client.get(url, headers={**student_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
 def test_get_event_packing_list_not_attending(
     client: TestClient, student_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -139,7 +204,7 @@ def test_get_my_packing_lists(
     user_id = get_user_id_from_token(client, student_token_headers)
 
     # Create multiple events with packing items
-    num_events = 2
+    num_events = 5
     num_equipments_per_event = 3
     created_events = []
 
@@ -160,6 +225,9 @@ def test_get_my_packing_lists(
 
     # Verify the response structure
     assert len(content) == num_events
+    # user, events, packing equipments and equipments, whatever the number of
+    # events
+    assert_query_budget(response, 4)
 
     for packing_list in content:
         # Verify event data
@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from app.core.config import settings
 from app.tests.utils.equipment import create_random_equipment
+from app.tests.utils.utils import assert_query_budget
 
 
 def test_create_equipment(
@@ -80,6 +81,28 @@ def test_read_equipments(
     assert response.status_code == 200
     content = response.json()
     assert len(content["data"]) >= 2
+    # user, count, equipments
+    assert_query_budget(response, 3)
+
+
+def test_read_equipments_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_equipment(db)
+    url = f"{settings.API_V1_STR}/equipments/"
+    etag = client.get(url, headers=superuser_token_headers).headers["ETag"]
+
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    create_random_equipment(db)
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
 
 
 def test_update_equipment(
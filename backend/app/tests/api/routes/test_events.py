@@ -1,14 +1,23 @@
+import json
 import uuid
+from datetime import date, timedelta
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, col, select
 
 from app.core.config import settings
+from app.db import Attendance, Event, EventMealOption, MealChoice, PackingEquipment
 from app.db.enums import RoleType
+from app.tests.utils.attendance import create_random_attendance
 from app.tests.utils.equipment import create_random_equipment
 from app.tests.utils.event import create_random_event
-from app.tests.utils.meal import create_random_meal
+from app.tests.utils.meal import (
+    create_meal_option,
+    create_random_meal,
+    create_random_meal_choice,
+)
 from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import assert_query_budget
 
 
 def test_create_event(
@@ -92,6 +101,118 @@ def test_read_event(
     assert content["id"] == str(event.id)
 
 
+def test_read_event_etag(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    equipment = create_random_equipment(db)
+    db.add(PackingEquipment(event_id=event.id, equipment_id=equipment.id))
+    db.commit()
+    url = f"{settings.API_V1_STR}/events/{event.id}"
+    response = client.get(url, headers=teacher_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={**teacher_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    # user and the version lookup, the event graph isn't loaded
+    assert_query_budget(response, 2)
+
+    # Editing equipment on the packing list changes the event's ETag
+    equipment.title = "Renamed"
+    db.add(equipment)
+    db.commit()
+    response = client.get(url, headers={**teacher_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["packing_equipments"][0]["equipment"]["title"] == "Renamed"
+
+
+def test_update_event_changes_etag(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    url = f"{settings.API_V1_STR}/events/{event.id}"
+    etag = client.get(url, headers=teacher_token_headers).headers["ETag"]
+
+    data = {
+        "coordinator_id": str(event.coordinator_id),
+        "packing_equipments": [
+            {"equipment_id": str(create_random_equipment(db).id), "quantity": 1}
+        ],
+    }
+    response = client.put(url, headers=teacher_token_headers, json=data)
+    assert response.status_code == 200
+
+    response = client.get(url, headers={**teacher_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["packing_equipments"]) == 1
+
+
+def test_read_event_overview(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    for _ in range(3):
+        db.add(
+            PackingEquipment(
+                event_id=event.id, equipment_id=create_random_equipment(db).id
+            )
+        )
+    db.commit()
+    chosen = create_meal_option(
+        db, event_id=event.id, meal_id=create_random_meal(db).id
+    )
+    unchosen = create_meal_option(
+        db, event_id=event.id, meal_id=create_random_meal(db).id
+    )
+    for quantity in (1, 2):
+        attendance = create_random_attendance(db, event_id=event.id)
+        create_random_meal_choice(
+            db,
+            attendance_id=attendance.id,
+            event_meal_option_id=chosen.id,
+            quantity=quantity,
+        )
+    create_random_attendance(db, event_id=event.id)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/events/{event.id}/overview",
+        headers=student_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == str(event.id)
+    assert content["name"] == event.name
+    assert content["attendee_count"] == 3
+    assert content["packing_equipments"]["count"] == 3
+    assert len(content["packing_equipments"]["data"]) == 3
+    assert "title" in content["packing_equipments"]["data"][0]["equipment"]
+    totals = {
+        option["id"]: (option["choice_count"], option["quantity_total"])
+        for option in content["meal_options"]
+    }
+    assert totals == {str(chosen.id): (2, 3), str(unchosen.id): (0, 0)}
+    assert all("name" in option["meal"] for option in content["meal_options"])
+    # user, event, packing page, equipments, packing count, meal option totals,
+    # meals, attendee count
+    assert_query_budget(response, 8)
+
+
+def test_read_event_overview_not_found(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/events/{uuid.uuid4()}/overview",
+        headers=student_token_headers,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Event not found"
+
+
 def test_read_event_not_found(
     client: TestClient, teacher_token_headers: dict[str, str]
 ) -> None:
@@ -116,6 +237,149 @@ def test_read_events(
     content = response.json()
     assert len(content["data"]) >= 2
     assert "count" in content
+    assert_query_budget(response, 7)
+
+
+def test_read_events_cursor_pages(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_event(db)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params: dict[str, str | int] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(
+            f"{settings.API_V1_STR}/events/",
+            headers=teacher_token_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        seen.extend(item["id"] for item in content["data"])
+        cursor = content["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == content["count"]
+
+
+def test_read_events_filters_by_dates_and_coordinator(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    coordinator = create_random_user(db, role=RoleType.STAFF)
+    june = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2031, 6, 10),
+        end_date=date(2031, 6, 12),
+    )
+    spanning = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2031, 6, 28),
+        end_date=date(2031, 7, 2),
+    )
+    august = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2031, 8, 1),
+        end_date=date(2031, 8, 3),
+    )
+    create_random_event(db, start_date=date(2031, 7, 1), end_date=date(2031, 7, 1))
+
+    def read_ids(**params: str) -> list[str]:
+        response = client.get(
+            f"{settings.API_V1_STR}/events/",
+            headers=teacher_token_headers,
+            params={"coordinator_id": str(coordinator.id), **params},
+        )
+        assert response.status_code == 200
+        content = response.json()
+        assert content["count"] == len(content["data"])
+        return [item["id"] for item in content["data"]]
+
+    assert read_ids() == [str(june.id), str(spanning.id), str(august.id)]
+    assert read_ids(**{"from": "2031-07-01", "to": "2031-07-31"}) == [str(spanning.id)]
+    assert read_ids(**{"from": "2031-07-03"}) == [str(august.id)]
+    assert read_ids(to="2031-06-27") == [str(june.id)]
+
+
+def test_read_events_upcoming(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    coordinator = create_random_user(db, role=RoleType.STAFF)
+    today = date.today()
+    create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=today - timedelta(days=5),
+        end_date=today - timedelta(days=1),
+    )
+    ongoing = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=today - timedelta(days=1),
+        end_date=today,
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/events/",
+        headers=teacher_token_headers,
+        params={"coordinator_id": str(coordinator.id), "upcoming": True},
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]] == [str(ongoing.id)]
+
+
+def test_read_event_calendar(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    coordinator = create_random_user(db, role=RoleType.STAFF)
+    starts_before = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2032, 1, 30),
+        end_date=date(2032, 2, 1),
+    )
+    ends_after = create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2032, 2, 29),
+        end_date=date(2032, 3, 2),
+    )
+    create_random_event(
+        db,
+        coordinator_id=coordinator.id,
+        start_date=date(2032, 3, 1),
+        end_date=date(2032, 3, 3),
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/events/calendar",
+        headers=student_token_headers,
+        params={"year": 2032, "month": 2, "coordinator_id": str(coordinator.id)},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["id"] for item in content["data"]] == [
+        str(starts_before.id),
+        str(ends_after.id),
+    ]
+    assert content["count"] == 2
+    assert content["data"][0]["start_date"] == "2032-01-30"
+
+
+def test_read_event_calendar_invalid_month(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/events/calendar",
+        headers=student_token_headers,
+        params={"year": 2032, "month": 13},
+    )
+    assert response.status_code == 422
 
 
 def test_update_event(
@@ -159,6 +423,55 @@ def test_delete_event(
     assert response.json()["message"] == "Event deleted"
 
 
+def test_delete_event_cascades_in_database(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db, packing_equipment_count=2)
+    option = create_meal_option(
+        db, event_id=event.id, meal_id=create_random_meal(db).id
+    )
+    attendances = [create_random_attendance(db, event_id=event.id) for _ in range(3)]
+    choices = [
+        create_random_meal_choice(
+            db, attendance_id=attendance.id, event_meal_option_id=option.id
+        )
+        for attendance in attendances
+    ]
+    # The instances expire once deleted, so keep their ids
+    event_id, option_id = event.id, option.id
+    attendance_ids = [attendance.id for attendance in attendances]
+    choice_ids = [choice.id for choice in choices]
+    response = client.delete(
+        f"{settings.API_V1_STR}/events/{event_id}",
+        headers=teacher_token_headers,
+    )
+    assert response.status_code == 200
+    # user, and one DELETE whatever the number of children
+    assert_query_budget(response, 2)
+
+    db.expire_all()
+    assert db.get(Event, event_id) is None
+    assert db.get(EventMealOption, option_id) is None
+    assert not db.exec(
+        select(PackingEquipment).where(PackingEquipment.event_id == event_id)
+    ).all()
+    assert all(
+        db.get(Attendance, attendance_id) is None for attendance_id in attendance_ids
+    )
+    assert all(db.get(MealChoice, choice_id) is None for choice_id in choice_ids)
+
+
+def test_delete_event_not_found(
+    client: TestClient, teacher_token_headers: dict[str, str]
+) -> None:
+    response = client.delete(
+        f"{settings.API_V1_STR}/events/{uuid.uuid4()}",
+        headers=teacher_token_headers,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Event not found"
+
+
 # Test creating an event with missing required fields
 def test_create_event_missing_fields(
     client: TestClient, superuser_token_headers: dict[str, str]
@@ -292,3 +605,418 @@ def test_create_event_nonexistent_coordinator(
     assert response.status_code == 404
     content = response.json()
     assert content["detail"] == f"User with id {non_existent_coordinator_id} not found"
+
+
+def test_read_events_query_count_independent_of_page_size(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    meal_options = []
+    for _ in range(5):
+        db_event = create_random_event(db, packing_equipment_count=2)
+        meal = create_random_meal(db)
+        meal_options.append(
+            create_meal_option(db, event_id=db_event.id, meal_id=meal.id)
+        )
+
+    for limit in (1, 5):
+        response = client.get(
+            f"{settings.API_V1_STR}/events/?limit={limit}",
+            headers=teacher_token_headers,
+        )
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == limit
+        # user, count, events, packing equipments, equipments, meal options, meals
+        assert_query_budget(response, 7)
+
+    for meal_option in meal_options:
+        db.delete(meal_option)
+    db.commit()
+
+
+def test_create_large_event_in_few_queries(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    coordinator = create_random_user(db, role=RoleType.STAFF)
+    equipments = [create_random_equipment(db) for _ in range(80)]
+    meals = [create_random_meal(db) for _ in range(3)]
+    data = {
+        "name": "Large Event",
+        "start_date": "2024-07-01",
+        "end_date": "2024-07-05",
+        "coordinator_id": str(coordinator.id),
+        "packing_equipments": [
+            {"equipment_id": str(equipment.id), "quantity": 1}
+            for equipment in equipments
+        ],
+        "meal_options": [
+            {"meal_id": str(meals[day % 3].id), "meal_type": meal_type, "day": day}
+            for day in range(1, 6)
+            for meal_type in ("breakfast", "lunch", "dinner")
+        ],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/events/",
+        headers=teacher_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["packing_equipments"]) == 80
+    assert len(content["meal_options"]) == 15
+    # token version, coordinator, 2 existence checks, 3 batched inserts, and
+    # the 5 queries loading the response
+    assert_query_budget(response, 12)
+
+
+def test_create_event_missing_meal_creates_nothing(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    equipment = create_random_equipment(db)
+    missing_meal_id = uuid.uuid4()
+    name = f"Half created {uuid.uuid4()}"
+    data = {
+        "name": name,
+        "start_date": "2024-07-01",
+        "end_date": "2024-07-05",
+        "coordinator_id": None,
+        "packing_equipments": [{"equipment_id": str(equipment.id)}],
+        "meal_options": [
+            {"meal_id": str(missing_meal_id), "meal_type": "lunch", "day": 1}
+        ],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/events/",
+        headers=teacher_token_headers,
+        json=data,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Meal with id {missing_meal_id} not found"
+    assert db.exec(select(Event).where(Event.name == name)).first() is None
+
+
+def test_import_events_ndjson(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    equipment = create_random_equipment(db)
+    meal = create_random_meal(db)
+    missing_equipment_id = uuid.uuid4()
+    tag = uuid.uuid4().hex
+    good = {
+        "name": f"{tag} good",
+        "start_date": "2033-05-01",
+        "end_date": "2033-05-02",
+        "coordinator_id": None,
+        "packing_equipments": [{"equipment_id": str(equipment.id), "quantity": 3}],
+        "meal_options": [{"meal_id": str(meal.id), "meal_type": "lunch", "day": 1}],
+    }
+    missing = {
+        **good,
+        "name": f"{tag} missing",
+        "packing_equipments": [{"equipment_id": str(missing_equipment_id)}],
+    }
+    lines = [
+        json.dumps(good),
+        "{not json",
+        json.dumps(missing),
+        json.dumps({**good, "start_date": "yesterday"}),
+        "",
+        json.dumps({**good, "name": f"{tag} second"}),
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/events/import",
+        headers={**teacher_token_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines),
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["created"] == 2
+    assert content["failed"] == 3
+    errors = {error["line"]: error["errors"] for error in content["errors"]}
+    assert list(errors) == [2, 3, 4]
+    assert errors[3] == [f"equipment with id {missing_equipment_id} not found"]
+    assert errors[4][0].startswith("start_date: ")
+
+    created = db.exec(select(Event).where(col(Event.name).startswith(tag))).all()
+    assert sorted(event.name for event in created) == [
+        f"{tag} good",
+        f"{tag} second",
+    ]
+    for event in created:
+        packing = db.exec(
+            select(PackingEquipment).where(PackingEquipment.event_id == event.id)
+        ).one()
+        assert (packing.equipment_id, packing.quantity) == (equipment.id, 3)
+        option = db.exec(
+            select(EventMealOption).where(EventMealOption.event_id == event.id)
+        ).one()
+        assert option.meal_id == meal.id
+
+
+def test_import_events_csv(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    equipment = create_random_equipment(db)
+    coordinator = create_random_user(db, role=RoleType.STAFF)
+    missing_coordinator_id = uuid.uuid4()
+    tag = uuid.uuid4().hex
+    packing = json.dumps([{"equipment_id": str(equipment.id)}]).replace('"', '""')
+    body = (
+        "name,description,start_date,end_date,coordinator_id,packing_equipments\r\n"
+        f'{tag} a,,2033-06-01,2033-06-03,{coordinator.id},"{packing}"\r\n'
+        f"{tag} b,Lake trip,2033-06-10,2033-06-11,,\r\n"
+        f"{tag} c,,2033-06-10,2033-06-11,{missing_coordinator_id},\r\n"
+        f"{tag} d,too few columns\r\n"
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/events/import",
+        headers={**teacher_token_headers, "Content-Type": "text/csv"},
+        content=body,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["created"] == 2
+    assert content["errors"] == [
+        {"line": 4, "errors": [f"User with id {missing_coordinator_id} not found"]},
+        {"line": 5, "errors": ["Expected 6 columns, got 2"]},
+    ]
+
+    created = {
+        event.name: event
+        for event in db.exec(select(Event).where(col(Event.name).startswith(tag)))
+    }
+    assert created[f"{tag} a"].coordinator_id == coordinator.id
+    assert created[f"{tag} a"].description is None
+    assert created[f"{tag} b"].description == "Lake trip"
+    assert created[f"{tag} b"].start_date == date(2033, 6, 10)
+
+
+def test_import_events_unsupported_format(
+    client: TestClient, teacher_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/events/import",
+        headers={**teacher_token_headers, "Content-Type": "application/xml"},
+        content="<events/>",
+    )
+    assert response.status_code == 415
+
+
+def test_import_events_by_student(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/events/import",
+        headers={**student_token_headers, "Content-Type": "application/x-ndjson"},
+        content="",
+    )
+    assert response.status_code == 403
+
+
+def test_clone_event(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(
+        db, start_date=date(2034, 7, 1), end_date=date(2034, 7, 5)
+    )
+    equipments = [create_random_equipment(db) for _ in range(2)]
+    for equipment in equipments:
+        db.add(
+            PackingEquipment(
+                event_id=event.id, equipment_id=equipment.id, quantity=4, notes="x"
+            )
+        )
+    db.commit()
+    option = create_meal_option(
+        db, event_id=event.id, meal_id=create_random_meal(db).id
+    )
+
+    response = client.post(
+        f"{settings.API_V1_STR}/events/{event.id}/clone",
+        headers=teacher_token_headers,
+        json={"name": "Summer camp 2035", "start_date": "2035-06-30"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] != str(event.id)
+    assert content["name"] == "Summer camp 2035"
+    assert content["description"] == event.description
+    assert (content["start_date"], content["end_date"]) == ("2035-06-30", "2035-07-04")
+    assert sorted(
+        (item["equipment"]["id"], item["quantity"], item["notes"])
+        for item in content["packing_equipments"]
+    ) == sorted((str(equipment.id), 4, "x") for equipment in equipments)
+    assert [
+        (item["meal"]["id"], item["meal_type"], item["day"])
+        for item in content["meal_options"]
+    ] == [(str(option.meal_id), option.meal_type.value, option.day)]
+    assert content["meal_options"][0]["id"] != str(option.id)
+
+    # The original is untouched
+    db.refresh(event)
+    assert event.start_date == date(2034, 7, 1)
+    assert len(event.packing_equipments) == 2
+
+
+def test_clone_event_keeps_name_and_dates(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/events/{event.id}/clone",
+        headers=teacher_token_headers,
+        json={},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["name"] == event.name
+    assert content["start_date"] == event.start_date.isoformat()
+    assert content["end_date"] == event.end_date.isoformat()
+    assert content["packing_equipments"] == []
+
+
+def test_clone_event_not_found(
+    client: TestClient, teacher_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/events/{uuid.uuid4()}/clone",
+        headers=teacher_token_headers,
+        json={},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Event not found"
+
+
+def test_update_event_syncs_packing_list(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db, packing_equipment_count=3)
+    rows = list(
+        db.exec(select(PackingEquipment).where(PackingEquipment.event_id == event.id))
+    )
+    kept, changed, _removed = rows
+    added = create_random_equipment(db)
+    data = {
+        "coordinator_id": str(event.coordinator_id),
+        "packing_equipments": [
+            {
+                "equipment_id": str(kept.equipment_id),
+                "quantity": kept.quantity,
+                "notes": kept.notes,
+            },
+            {"equipment_id": str(changed.equipment_id), "quantity": 7},
+            {"equipment_id": str(added.id), "quantity": 1},
+        ],
+    }
+    response = client.put(
+        f"{settings.API_V1_STR}/events/{event.id}",
+        headers=teacher_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    quantities = {
+        item["equipment"]["id"]: item["quantity"]
+        for item in response.json()["packing_equipments"]
+    }
+    assert quantities == {
+        str(kept.equipment_id): kept.quantity,
+        str(changed.equipment_id): 7,
+        str(added.id): 1,
+    }
+    # Matching rows are updated in place rather than replaced
+    db.expire_all()
+    ids = set(
+        db.exec(
+            select(PackingEquipment.id).where(PackingEquipment.event_id == event.id)
+        )
+    )
+    assert {kept.id, changed.id} <= ids
+    assert len(ids) == 3
+
+
+def test_update_event_small_edit_query_count(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    rows = [
+        PackingEquipment(
+            event_id=event.id, equipment_id=create_random_equipment(db).id, quantity=2
+        )
+        for _ in range(50)
+    ]
+    db.add_all(rows)
+    db.commit()
+    data = {
+        "coordinator_id": str(event.coordinator_id),
+        "packing_equipments": [
+            {
+                "equipment_id": str(row.equipment_id),
+                "quantity": row.quantity + (1 if i == 0 else 0),
+                "notes": row.notes,
+            }
+            for i, row in enumerate(rows)
+        ],
+    }
+    response = client.put(
+        f"{settings.API_V1_STR}/events/{event.id}",
+        headers=teacher_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    # token version, coordinator, event, packing rows, one update, the event's
+    # version bump, and the response
+    assert_query_budget(response, 11)
+
+
+def test_update_event_syncs_meal_options(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    meal = create_random_meal(db)
+    option = create_meal_option(db, event_id=event.id, meal_id=meal.id)
+    data = {
+        "coordinator_id": str(event.coordinator_id),
+        "meal_options": [
+            {
+                "meal_id": str(meal.id),
+                "meal_type": "lunch",
+                "day": 1,
+                "max_quantity": 10,
+            },
+            {"meal_id": str(meal.id), "meal_type": "dinner", "day": 1},
+        ],
+    }
+    response = client.put(
+        f"{settings.API_V1_STR}/events/{event.id}",
+        headers=teacher_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    options = {item["meal_type"]: item for item in response.json()["meal_options"]}
+    assert set(options) == {"lunch", "dinner"}
+    assert options["lunch"]["id"] == str(option.id)
+    assert options["lunch"]["max_quantity"] == 10
+
+
+def test_update_event_keeps_chosen_meal_option(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    event = create_random_event(db)
+    meal = create_random_meal(db)
+    option = create_meal_option(db, event_id=event.id, meal_id=meal.id)
+    attendance = create_random_attendance(db, event_id=event.id)
+    meal_choice = create_random_meal_choice(
+        db, attendance_id=attendance.id, event_meal_option_id=option.id
+    )
+    response = client.put(
+        f"{settings.API_V1_STR}/events/{event.id}",
+        headers=teacher_token_headers,
+        json={"coordinator_id": str(event.coordinator_id), "meal_options": []},
+    )
+    assert response.status_code == 409
+    assert str(option.id) in response.json()["detail"]
+    db.expire_all()
+    assert db.get(EventMealOption, option.id) is not None
+
+    db.delete(meal_choice)
+    db.delete(attendance)
+    db.commit()
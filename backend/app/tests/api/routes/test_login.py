@@ -1,11 +1,23 @@
+import asyncio
+import threading
+from datetime import timedelta
 from unittest.mock import patch
 
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
 from sqlmodel import Session, select
 
+from app import crud
 from app.core.config import settings
-from app.core.security import verify_password
+from app.core.hashing import PasswordHasher, password_hasher
+from app.core.login_throttle import LoginThrottle, MemoryFailureStore, login_throttle
+from app.core.security import create_user_access_token, verify_password
 from app.db import User
+from app.schemas import UserCreate
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import random_email, random_lower_string
 from app.utils import generate_password_reset_token
 
 
@@ -30,6 +42,131 @@ def test_get_access_token_incorrect_password(client: TestClient) -> None:
     assert r.status_code == 400
 
 
+def test_login_rehashes_password_with_new_cost(client: TestClient, db: Session) -> None:
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=random_email(), password=password)
+    )
+    cheaper = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user.hashed_password = cheaper.hash(password)
+    db.add(user)
+    db.commit()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": user.email, "password": password},
+    )
+    assert r.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert verify_password(password, user.hashed_password)
+
+
+def test_password_hasher_sheds_load() -> None:
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run() -> None:
+        jobs = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.run(release.wait)
+        assert exc_info.value.status_code == 429
+        status = hasher.status()
+        assert (status["running"], status["queued"]) == (1, 1)
+        assert status["rejected"] == 1
+        release.set()
+        await asyncio.gather(*jobs)
+
+    asyncio.run(run())
+    status = hasher.status()
+    assert (status["running"], status["queued"], status["completed"]) == (0, 0, 2)
+    assert status["wait_time"]["count"] == 2
+
+
+def test_login_throttle_window() -> None:
+    throttle = LoginThrottle(
+        MemoryFailureStore(max_per_key=3),
+        window_seconds=60,
+        max_per_email=2,
+        max_per_ip=3,
+    )
+
+    async def run() -> None:
+        await throttle.record_failure("A@example.com", "10.0.0.1")
+        await throttle.check("a@example.com", "10.0.0.1")
+        await throttle.record_failure("a@example.com", "10.0.0.1")
+        with pytest.raises(HTTPException) as exc_info:
+            await throttle.check("a@example.com", "10.0.0.2")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers is not None
+        assert 0 < int(exc_info.value.headers["Retry-After"]) <= 60
+
+        await throttle.record_success("a@example.com")
+        await throttle.check("a@example.com", "10.0.0.1")
+        # The address still counts failures across emails
+        await throttle.record_failure("b@example.com", "10.0.0.1")
+        with pytest.raises(HTTPException):
+            await throttle.check("c@example.com", "10.0.0.1")
+
+    asyncio.run(run())
+
+
+def test_login_throttled_without_hashing(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(login_throttle, "max_per_email", 2)
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=random_email(), password=password)
+    )
+    url = f"{settings.API_V1_STR}/login/access-token"
+    for _ in range(2):
+        r = client.post(url, data={"username": user.email, "password": "incorrect"})
+        assert r.status_code == 400
+
+    completed = password_hasher.status()["completed"]
+    r = client.post(url, data={"username": user.email, "password": password})
+    assert r.status_code == 429
+    assert "Retry-After" in r.headers
+    assert password_hasher.status()["completed"] == completed
+
+
+def test_login_unknown_email_still_hashes(client: TestClient) -> None:
+    completed = password_hasher.status()["completed"]
+    r = client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": random_email(), "password": "incorrect"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Incorrect email or password"
+    assert password_hasher.status()["completed"] == completed + 1
+
+
+def test_logout_revokes_only_that_token(client: TestClient, db: Session) -> None:
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=random_email(), password=password)
+    )
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    # Another device, with a token of its own
+    other_headers = {
+        "Authorization": "Bearer "
+        + create_user_access_token(user, expires_delta=timedelta(minutes=5))
+    }
+    r = client.post(f"{settings.API_V1_STR}/logout", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"message": "Logged out successfully"}
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Could not validate credentials"
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=other_headers)
+    assert r.status_code == 200
+
+
 def test_use_access_token(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
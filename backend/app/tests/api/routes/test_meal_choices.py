@@ -39,6 +39,29 @@ def test_create_meal_choice(
     assert content["notes"] == "No spicy"
 
 
+def test_create_meal_choice_twice(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    user_id = get_user_id_from_token(client, student_token_headers)
+    attendance = create_random_attendance(db, user_id=user_id)
+    meal_option = create_meal_option(db, attendance.event_id, create_random_meal(db).id)
+
+    data = {
+        "attendance_id": str(attendance.id),
+        "event_meal_option_id": str(meal_option.id),
+        "quantity": 1,
+    }
+    url = f"{settings.API_V1_STR}/meal-choices/"
+    response = client.post(url, headers=student_token_headers, json=data)
+    assert response.status_code == 200
+    response = client.post(url, headers=student_token_headers, json=data)
+    assert response.status_code == 409
+    assert (
+        response.json()["detail"]
+        == "This meal option is already chosen for the attendance"
+    )
+
+
 def test_read_meal_choices(
     client: TestClient, student_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -88,6 +111,30 @@ def test_update_meal_choice(
     assert content["notes"] == "Extra sauce"
 
 
+def test_update_meal_choice_to_chosen_option(
+    client: TestClient, student_token_headers: dict[str, str], db: Session
+) -> None:
+    user_id = get_user_id_from_token(client, student_token_headers)
+    attendance = create_random_attendance(db, user_id=user_id)
+    options = [
+        create_meal_option(db, attendance.event_id, create_random_meal(db).id)
+        for _ in range(2)
+    ]
+    choices = [
+        create_random_meal_choice(
+            db, attendance_id=attendance.id, event_meal_option_id=option.id
+        )
+        for option in options
+    ]
+
+    response = client.put(
+        f"{settings.API_V1_STR}/meal-choices/{choices[1].id}",
+        headers=student_token_headers,
+        json={"event_meal_option_id": str(options[0].id)},
+    )
+    assert response.status_code == 409
+
+
 def test_delete_meal_choice(
     client: TestClient, student_token_headers: dict[str, str], db: Session
 ) -> None:
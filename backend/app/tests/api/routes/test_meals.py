@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from app.core.config import settings
 from app.tests.utils.meal import create_random_meal
+from app.tests.utils.utils import assert_query_budget
 
 
 def test_create_meal(client: TestClient, teacher_token_headers: dict[str, str]) -> None:
@@ -78,6 +79,27 @@ def test_read_meal(
     assert content["id"] == str(meal.id)
 
 
+def test_read_meal_etag(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    meal = create_random_meal(db)
+    url = f"{settings.API_V1_STR}/meals/{meal.id}"
+    etag = client.get(url, headers=teacher_token_headers).headers["ETag"]
+
+    response = client.get(url, headers={**teacher_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    response = client.put(
+        url, headers=teacher_token_headers, json={"name": "Updated Meal"}
+    )
+    assert response.status_code == 200
+    response = client.get(url, headers={**teacher_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["name"] == "Updated Meal"
+
+
 def test_read_meal_not_found(
     client: TestClient, teacher_token_headers: dict[str, str]
 ) -> None:
@@ -101,6 +123,8 @@ def test_read_meals(
     assert response.status_code == 200
     content = response.json()
     assert len(content) >= 2
+    # user, meals
+    assert_query_budget(response, 2)
 
 
 def test_update_meal(
@@ -315,3 +339,26 @@ def test_read_meal_by_student(
     content = response.json()
     assert content["id"] == str(meal.id)
     assert content["name"] == meal.name
+
+
+def test_read_meals_cursor_header(
+    client: TestClient, teacher_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_meal(db)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/meals/?limit=1",
+        headers=teacher_token_headers,
+    )
+    assert response.status_code == 200
+    first = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/meals/",
+        headers=teacher_token_headers,
+        params={"limit": 1, "cursor": cursor},
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["id"] != first[0]["id"]
@@ -7,9 +7,20 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.db import User
+from app.db import Attendance, Event, MealChoice, User
 from app.schemas import UserCreate
-from app.tests.utils.utils import random_email, random_lower_string
+from app.tests.utils.attendance import create_random_attendance
+from app.tests.utils.event import create_random_event
+from app.tests.utils.meal import (
+    create_meal_option,
+    create_random_meal,
+    create_random_meal_choice,
+)
+from app.tests.utils.utils import (
+    assert_query_budget,
+    random_email,
+    random_lower_string,
+)
 
 
 def test_get_users_superuser_me(
@@ -187,10 +198,81 @@ def test_retrieve_users(
 
     assert len(all_users["data"]) > 1
     assert "count" in all_users
+    # user, count, users
+    assert_query_budget(r, 3)
     for item in all_users["data"]:
         assert "email" in item
 
 
+def test_retrieve_users_cursor_pages(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        crud.create_user(
+            session=db,
+            user_create=UserCreate(
+                email=random_email(), password=random_lower_string()
+            ),
+        )
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params: dict[str, str | int] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params=params,
+        )
+        assert r.status_code == 200
+        page = r.json()
+        seen.extend(item["id"] for item in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == page["count"]
+
+
+def test_retrieve_users_count_modes(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    url = f"{settings.API_V1_STR}/users/"
+    r = client.get(url, headers=superuser_token_headers)
+    exact = r.json()["count"]
+
+    # A committed write drops the cached total
+    crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.json()["count"] == exact + 1
+
+    r = client.get(url, headers=superuser_token_headers, params={"count": "estimate"})
+    assert r.status_code == 200
+    assert isinstance(r.json()["count"], int)
+
+    r = client.get(url, headers=superuser_token_headers, params={"count": "none"})
+    assert r.status_code == 200
+    assert r.json()["count"] is None
+    assert len(r.json()["data"]) > 0
+
+
+def test_retrieve_users_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
 def test_update_user_me(
     client: TestClient, student_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -467,6 +549,38 @@ def test_delete_user_super_user(
     assert result is None
 
 
+def test_delete_user_cascades_in_database(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    coordinated = create_random_event(db, coordinator_id=user.id)
+    attendance = create_random_attendance(db, user_id=user.id)
+    option = create_meal_option(
+        db, event_id=attendance.event_id, meal_id=create_random_meal(db).id
+    )
+    choice = create_random_meal_choice(
+        db, attendance_id=attendance.id, event_meal_option_id=option.id
+    )
+    # The instances expire once deleted, so keep their ids
+    user_id, event_id = user.id, coordinated.id
+    attendance_id, choice_id = attendance.id, choice.id
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{user_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+
+    db.expire_all()
+    assert db.get(Attendance, attendance_id) is None
+    assert db.get(MealChoice, choice_id) is None
+    event = db.get(Event, event_id)
+    assert event is not None
+    assert event.coordinator_id is None
+
+
 def test_delete_user_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_health_check(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/health-check/")
+    assert r.status_code == 200
+    assert r.json() is True
+
+
+def test_db_pool_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 2
+    pools = {pool["name"]: pool for pool in content["data"]}
+    assert set(pools) == {"async", "sync"}
+    async_pool = pools["async"]
+    assert async_pool["size"] == settings.POSTGRES_POOL_SIZE
+    # The admin comes from the user cache, the request may hold no connection
+    assert async_pool["checked_out"] >= 0
+    assert async_pool["overflow"] >= 0
+    assert async_pool["wait_time"]["count"] >= 1
+    assert (
+        sum(async_pool["wait_time"]["buckets"].values())
+        == (async_pool["wait_time"]["count"])
+    )
+
+
+def test_db_pool_status_not_admin(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=student_token_headers
+    )
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Only admins can access this resource"
+
+
+def test_password_hashing_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/password-hashing/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["workers"] == settings.PASSWORD_HASH_WORKERS
+    assert content["max_queue"] == settings.PASSWORD_HASH_MAX_QUEUE
+    # The superuser logged in through the pool
+    assert content["completed"] >= 1
+    assert content["wait_time"]["count"] >= 1
+
+
+def test_token_cache_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/utils/token-cache/"
+    client.get(url, headers=superuser_token_headers)
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["max_entries"] == settings.TOKEN_CACHE_MAX_ENTRIES
+    assert content["size"] >= 1
+    assert content["hits"] >= 1
+    assert 0 < content["hit_rate"] <= 1
@@ -0,0 +1,416 @@
+import asyncio
+import time
+import uuid
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.core.replica import RecentWriters, recent_writers
+from app.core.revocation import RevocationList, token_digest
+from app.core.token_cache import TokenCache, token_cache
+from app.core.user_cache import UserCache
+from app.db import RevokedToken, User
+from app.db.enums import RoleType
+from app.schemas import TokenPayload, UserCreate
+from app.tests.utils.event import create_random_event
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import (
+    assert_query_budget,
+    get_user_id_from_token,
+    random_email,
+    random_lower_string,
+)
+
+
+@pytest.fixture()
+def replica_engine(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[tuple[AsyncEngine, list[Any]], None, None]:
+    """A "replica" pointing at the test database that records its checkouts"""
+    replica = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+    checkouts: list[Any] = []
+    event.listen(replica.sync_engine, "checkout", lambda *args: checkouts.append(args))
+    monkeypatch.setattr(deps, "replica_async_engine", replica)
+    recent_writers.clear()
+    yield replica, checkouts
+    recent_writers.clear()
+
+
+def test_recent_writers_window() -> None:
+    writers = RecentWriters(window_seconds=60)
+    writers.mark("a")
+    assert writers.is_recent("a")
+    assert not writers.is_recent("b")
+
+    expired = RecentWriters(window_seconds=0)
+    expired.mark("a")
+    assert not expired.is_recent("a")
+
+
+def test_recent_writers_bounded() -> None:
+    writers = RecentWriters(window_seconds=60, max_entries=2)
+    for user_id in ("a", "b", "c"):
+        writers.mark(user_id)
+    assert not writers.is_recent("a")
+    assert writers.is_recent("b")
+    assert writers.is_recent("c")
+
+
+def _user() -> User:
+    return User(id=uuid.uuid4(), email="cached@example.com", hashed_password="x")
+
+
+def test_user_cache_lru() -> None:
+    cache = UserCache(ttl_seconds=60, max_entries=2)
+    users = [_user() for _ in range(3)]
+    for user in users[:2]:
+        cache.put(user, cache.generation)
+    # Touch the first user so the second one is evicted
+    assert cache.get(users[0].id) is not None
+    cache.put(users[2], cache.generation)
+    assert cache.get(users[1].id) is None
+    assert cache.get(users[0].id) is not None
+    assert cache.get(users[2].id) is not None
+
+
+def test_user_cache_ttl_and_invalidation() -> None:
+    expired = UserCache(ttl_seconds=0)
+    user = _user()
+    expired.put(user, expired.generation)
+    assert expired.get(user.id) is None
+
+    cache = UserCache(ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate(uuid.uuid4())
+    # A load that started before an invalidation is not stored
+    cache.put(user, generation)
+    assert cache.get(user.id) is None
+    cache.put(user, cache.generation)
+    assert cache.get(user.id) == user.model_dump()
+    cache.invalidate(user.id)
+    assert cache.get(user.id) is None
+
+
+def test_token_cache_expiry_and_stats() -> None:
+    cache = TokenCache(max_entries=2)
+    payload = TokenPayload(sub=str(uuid.uuid4()))
+    cache.put("expired", time.time() - 1, payload)
+    cache.put("a", time.time() + 60, payload)
+    assert cache.get("expired") is None
+    assert cache.get("a") is payload
+    cache.put("b", time.time() + 60, payload)
+    cache.put("c", time.time() + 60, payload)
+    # "a" was used before "b", but "b" was stored after it
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 1, 2)
+    assert stats["hit_rate"] == round(1 / 3, 4)
+
+
+def test_decode_token_cached() -> None:
+    user_id = uuid.uuid4()
+    token = security.create_access_token(user_id, expires_delta=timedelta(minutes=5))
+    hits = token_cache.stats()["hits"]
+    assert deps.decode_token(token).sub == str(user_id)
+    assert deps.decode_token(token).sub == str(user_id)
+    assert token_cache.stats()["hits"] == hits + 1
+
+
+def test_revocation_list_by_token_and_user() -> None:
+    revocations = RevocationList()
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    issued = TokenPayload(sub=str(user_id), iat=int(now.timestamp()) - 10)
+    assert not revocations.is_revoked("token", issued)
+
+    expires_at = now + timedelta(minutes=1)
+    revocations.add(
+        [
+            RevokedToken(
+                token_digest=token_digest("token"),
+                revoked_at=now,
+                expires_at=expires_at,
+            )
+        ]
+    )
+    assert revocations.is_revoked("token", issued)
+    assert not revocations.is_revoked("other", issued)
+
+    revocations.add(
+        [RevokedToken(user_id=user_id, revoked_at=now, expires_at=expires_at)]
+    )
+    assert revocations.is_revoked("other", issued)
+    assert revocations.is_revoked("other", TokenPayload(sub=str(user_id)))
+    reissued = TokenPayload(sub=str(user_id), iat=int(now.timestamp()) + 10)
+    assert not revocations.is_revoked("new", reissued)
+
+    revocations.add(
+        [
+            RevokedToken(
+                token_digest=token_digest("expired"),
+                revoked_at=now - timedelta(days=1),
+                expires_at=now - timedelta(seconds=1),
+            )
+        ]
+    )
+    revocations.prune()
+    assert not revocations.is_revoked("expired", TokenPayload(sub="x"))
+    assert revocations.is_revoked("token", TokenPayload(sub="x"))
+
+
+def test_revocation_list_token_issued_in_revocation_second() -> None:
+    revocations = RevocationList()
+    user_id = uuid.uuid4()
+    # Late in the current second, so the token below is issued in it or after
+    revoked_at = datetime.fromtimestamp(int(time.time()), timezone.utc).replace(
+        microsecond=999999
+    )
+    revocations.add(
+        [
+            RevokedToken(
+                user_id=user_id,
+                revoked_at=revoked_at,
+                expires_at=revoked_at + timedelta(minutes=1),
+            )
+        ]
+    )
+    token = security.create_access_token(user_id, expires_delta=timedelta(minutes=5))
+    assert not revocations.is_revoked(token, deps.decode_token(token))
+    earlier = TokenPayload(sub=str(user_id), iat=int(revoked_at.timestamp()) - 1)
+    assert revocations.is_revoked("earlier", earlier)
+
+
+def test_revocation_list_refresh(db: Session) -> None:
+    """Rows inserted by other workers show up on the next refresh"""
+    revocations = RevocationList()
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+
+    async def refresh() -> None:
+        async with AsyncSession(engine) as session:
+            await revocations.refresh(session)
+
+    def revoke(token: str) -> None:
+        now = datetime.now(timezone.utc)
+        db.add(
+            RevokedToken(
+                token_digest=token_digest(token),
+                revoked_at=now,
+                expires_at=now + timedelta(minutes=1),
+            )
+        )
+        db.commit()
+
+    payload = TokenPayload(sub=str(uuid.uuid4()))
+    first, second = random_lower_string(), random_lower_string()
+    revoke(first)
+    asyncio.run(refresh())
+    assert revocations.is_revoked(first, payload)
+    revoke(second)
+    assert not revocations.is_revoked(second, payload)
+    asyncio.run(refresh())
+    assert revocations.is_revoked(second, payload)
+
+
+def test_current_user_served_from_cache(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    client.get(url, headers=student_token_headers)
+    r = client.get(url, headers=student_token_headers)
+    assert r.status_code == 200
+    assert_query_budget(r, 0)
+
+
+def test_current_user_role_change_revokes_token(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+) -> None:
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=random_email(), password=password)
+    )
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    url = f"{settings.API_V1_STR}/users/me"
+    assert client.get(url, headers=headers).json()["role_type"] == "student"
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"role_type": "staff"},
+    )
+    assert r.status_code == 200
+    r = client.get(url, headers=headers)
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Could not validate credentials"
+
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    assert client.get(url, headers=headers).json()["role_type"] == "staff"
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"is_active": False},
+    )
+    assert r.status_code == 200
+    r = client.get(url, headers=headers)
+    assert r.status_code == 403
+    # The role change and deactivation also revoke the user's tokens on every
+    # worker. A token issued in a revocation's second is left to the token
+    # version check.
+    revoked = db.exec(select(RevokedToken).where(RevokedToken.user_id == user.id))
+    assert len(revoked.all()) == 2
+
+
+def test_current_user_other_changes_keep_token(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+) -> None:
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=random_email(), password=password)
+    )
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"full_name": "Renamed"},
+    )
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["full_name"] == "Renamed"
+
+
+def test_access_token_claims(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    token = security.create_user_access_token(user, expires_delta=timedelta(minutes=5))
+    claims = deps.decode_token(token)
+    assert claims.sub == str(user.id)
+    assert claims.role_type == RoleType.STUDENT
+    assert claims.is_active is True
+    assert claims.token_version == user.token_version
+
+
+def test_role_gate_reads_role_from_token(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/utils/db-pool/"
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    # At most the token version lookup, the user row is not loaded
+    assert_query_budget(r, 1)
+
+
+def test_role_gate_rejects_token_role(
+    client: TestClient, student_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=student_token_headers
+    )
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Only admins can access this resource"
+
+
+def test_reads_use_replica(
+    client: TestClient,
+    student_token_headers: dict[str, str],
+    replica_engine: tuple[AsyncEngine, list[Any]],
+) -> None:
+    _, checkouts = replica_engine
+    r = client.get(f"{settings.API_V1_STR}/events/", headers=student_token_headers)
+    assert r.status_code == 200
+    assert len(checkouts) == 1
+
+
+def test_reads_stick_to_primary_after_write(
+    client: TestClient,
+    student_token_headers: dict[str, str],
+    db: Session,
+    replica_engine: tuple[AsyncEngine, list[Any]],
+) -> None:
+    _, checkouts = replica_engine
+    event_obj = create_random_event(db)
+    r = client.post(
+        f"{settings.API_V1_STR}/attendance/{event_obj.id}/join",
+        headers=student_token_headers,
+    )
+    assert r.status_code == 200
+
+    r = client.get(
+        f"{settings.API_V1_STR}/attendance/my-events", headers=student_token_headers
+    )
+    assert r.status_code == 200
+    assert str(event_obj.id) in [e["id"] for e in r.json()]
+    assert checkouts == []
+
+
+def test_teacher_reads_stick_to_primary_after_write(
+    client: TestClient,
+    teacher_token_headers: dict[str, str],
+    replica_engine: tuple[AsyncEngine, list[Any]],
+) -> None:
+    # The write is gated by require_teacher alone, without CurrentUser
+    _, checkouts = replica_engine
+    data = {
+        "name": "Sticky Event",
+        "start_date": "2024-07-01",
+        "end_date": "2024-07-02",
+    }
+    r = client.post(
+        f"{settings.API_V1_STR}/events/", headers=teacher_token_headers, json=data
+    )
+    assert r.status_code == 200
+    event_id = r.json()["id"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/events/{event_id}", headers=teacher_token_headers
+    )
+    assert r.status_code == 200
+    assert r.json()["name"] == "Sticky Event"
+    assert checkouts == []
+
+
+def test_writes_never_use_replica(
+    client: TestClient,
+    teacher_token_headers: dict[str, str],
+    replica_engine: tuple[AsyncEngine, list[Any]],
+) -> None:
+    _, checkouts = replica_engine
+    data = {
+        "name": "Replica Event",
+        "start_date": "2024-07-01",
+        "end_date": "2024-07-02",
+        "coordinator_id": str(get_user_id_from_token(client, teacher_token_headers)),
+    }
+    r = client.post(
+        f"{settings.API_V1_STR}/events/", headers=teacher_token_headers, json=data
+    )
+    assert r.status_code == 200
+    assert checkouts == []
@@ -0,0 +1,42 @@
+import asyncio
+
+import httpx
+
+from app.benchmarks.runner import Scenario, percentile, run_scenario
+
+
+def test_percentile() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_scenario_summary() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = 500 if request.url.path == "/fail" else 200
+        return httpx.Response(status, headers={"X-Query-Count": "2"})
+
+    async def send(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get("/fail" if index % 5 == 0 else "/ok")
+
+    async def run() -> dict[str, object]:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            return await run_scenario(
+                client,
+                Scenario("mock", "Mock transport", send),
+                requests=20,
+                concurrency=4,
+                warmup=5,
+            )
+
+    result = asyncio.run(run())
+    assert result["requests"] == 20
+    # Measured indexes are 5..24, every fifth one fails
+    assert result["errors"] == 4
+    assert result["status_codes"] == {"200": 16, "500": 4}
+    assert result["queries_per_request"] == {"mean": 2.0, "max": 2}
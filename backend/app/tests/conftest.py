@@ -14,6 +14,7 @@ from app.db import (
     Meal,
     MealChoice,
     PackingEquipment,
+    RevokedToken,
     User,
 )
 from app.db.enums import RoleType
@@ -37,6 +38,7 @@ def db() -> Generator[Session, None, None]:
             Event,
             Meal,
             User,
+            RevokedToken,
         ]
         # Delete each model
         for model in models_to_delete:
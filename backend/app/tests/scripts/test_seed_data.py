@@ -0,0 +1,74 @@
+import secrets
+from typing import Any
+
+import pytest
+from sqlmodel import Session, col, delete, func, select
+
+from app.db import (
+    Attendance,
+    Equipment,
+    Event,
+    EventMealOption,
+    Meal,
+    MealChoice,
+    PackingEquipment,
+    User,
+)
+from app.seed_data import GENERATORS, SeedIds, SeedVolumes, seed
+
+VOLUMES = SeedVolumes(
+    users=5,
+    events=3,
+    equipments=4,
+    meals=2,
+    attendances=10,
+    meal_choices=20,
+    packing_per_event=2,
+    meal_options_per_event=3,
+)
+
+
+def test_seed_loads_requested_volumes(db: Session) -> None:
+    run = secrets.randbits(64)
+    ids = SeedIds(run)
+    tag = seed(VOLUMES, run=run)
+    expected: dict[type[Any], tuple[int, int]] = {
+        User: (ids.USER, VOLUMES.users),
+        Equipment: (ids.EQUIPMENT, VOLUMES.equipments),
+        Meal: (ids.MEAL, VOLUMES.meals),
+        Event: (ids.EVENT, VOLUMES.events),
+        PackingEquipment: (ids.PACKING, VOLUMES.events * VOLUMES.packing_per_event),
+        EventMealOption: (
+            ids.MEAL_OPTION,
+            VOLUMES.events * VOLUMES.meal_options_per_event,
+        ),
+        Attendance: (ids.ATTENDANCE, VOLUMES.attendances),
+        MealChoice: (ids.MEAL_CHOICE, VOLUMES.meal_choices),
+    }
+    try:
+        for model, (kind, count) in expected.items():
+            seeded_ids = [ids(kind, n) for n in range(count)]
+            statement = (
+                select(func.count())
+                .select_from(model)
+                .where(col(model.id).in_(seeded_ids))
+            )
+            assert db.exec(statement).one() == count
+        user = db.exec(select(User).where(User.id == ids(ids.USER, 1))).one()
+        assert user.email == f"{tag}-1@example.com"
+    finally:
+        for model, _ in reversed(GENERATORS):
+            kind, count = expected[model]
+            db.execute(
+                delete(model).where(
+                    col(model.id).in_([ids(kind, n) for n in range(count)])
+                )
+            )
+        db.commit()
+
+
+def test_seed_rejects_volumes_breaking_unique_constraints() -> None:
+    with pytest.raises(ValueError):
+        seed(SeedVolumes(users=2, events=2, attendances=5))
+    with pytest.raises(ValueError):
+        seed(SeedVolumes(attendances=10, meal_choices=100, meal_options_per_event=2))
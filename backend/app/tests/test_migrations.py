@@ -0,0 +1,22 @@
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlmodel import SQLModel
+
+from app.core.db import engine
+from app.db import tables  # noqa: F401
+
+
+def test_database_is_at_head() -> None:
+    script = ScriptDirectory.from_config(Config("alembic.ini"))
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection)
+        assert set(context.get_current_heads()) == set(script.get_heads())
+
+
+def test_models_match_migrations() -> None:
+    """Every index and constraint in app/db/tables.py has a migration"""
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": True})
+        assert compare_metadata(context, SQLModel.metadata) == []
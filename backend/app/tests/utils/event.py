@@ -1,4 +1,5 @@
 import uuid
+from datetime import date
 
 from sqlmodel import Session, select
 
@@ -12,6 +13,8 @@ def create_random_event(
     db: Session,
     *,
     coordinator_id: uuid.UUID | None = None,
+    start_date: date = date(2024, 7, 1),
+    end_date: date = date(2024, 7, 5),
     packing_equipment_count: int = 0,
 ) -> Event:
     """Create a random event with optional packing items.
@@ -19,6 +22,7 @@ def create_random_event(
     Args:
         db: Database session
         coordinator_id: Event coordinator
+        start_date, end_date: Event dates
         packing_items_count: Number of packing items to create/attach
             If > 0, will try to use existing items first, then create new ones if needed
     """
@@ -29,8 +33,8 @@ def create_random_event(
     event = Event(
         name=random_lower_string(),
         description=random_lower_string(),
-        start_date="2024-07-01",
-        end_date="2024-07-05",
+        start_date=start_date,
+        end_date=end_date,
         coordinator_id=coordinator_id,
     )
     db.add(event)
@@ -3,6 +3,7 @@ import string
 import uuid
 
 from fastapi.testclient import TestClient
+from httpx import Response
 
 from app.core.config import settings
 
@@ -42,3 +43,13 @@ def get_user_id_from_token(
     response = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
     current_user = response.json()
     return uuid.UUID(current_user["id"])
+
+
+def assert_query_budget(response: Response, budget: int) -> None:
+    """Fail when the request ran more SQL statements than its budget
+
+    The count comes from the X-Query-Count header and includes queries made by
+    dependencies, such as loading the current user.
+    """
+    count = int(response.headers["X-Query-Count"])
+    assert count <= budget, f"{count} queries, budget is {budget}"